@@ -1,6 +1,8 @@
 import os
 import sys
+import copy
 import ruamel.yaml as yaml
+from functools import lru_cache
 
 from lightflow.models.exceptions import ConfigLoadError, ConfigFieldError
 
@@ -28,6 +30,19 @@ def expand_env_var(env_var):
             env_var = interpolated
 
 
+@lru_cache(maxsize=8)
+def _parse_yaml(text):
+    """ Parses a YAML string once and caches the resulting dictionary.
+
+        Args:
+            text (str): The YAML string that should be parsed.
+
+        Returns:
+            dict: The parsed YAML. The cached dictionary must not be modified.
+    """
+    return yaml.safe_load(text)
+
+
 class Config:
     """ Hosts the global configuration.
 
@@ -164,7 +179,7 @@ class Config:
 
     def set_to_default(self):
         """ Overwrite the configuration with the default configuration. """
-        self._config = yaml.safe_load(self.default())
+        self._config = copy.deepcopy(_parse_yaml(self.default()))
 
     def _update_from_file(self, filename):
         """ Helper method to update an existing configuration with the values from a file.
@@ -203,10 +218,12 @@ class Config:
 
     def _update_python_paths(self):
         """ Append the workflow and libraries paths to the PYTHONPATH. """
+        existing_paths = set(sys.path)
         for path in self._config['workflows'] + self._config['libraries']:
             if os.path.isdir(os.path.abspath(path)):
-                if path not in sys.path:
+                if path not in existing_paths:
                     sys.path.append(path)
+                    existing_paths.add(path)
             else:
                 raise ConfigLoadError(
                     'Workflow directory {} does not exist'.format(path))
@@ -244,6 +261,9 @@ store:
   auth_source: admin
   auth_mechanism: null
   connect_timeout: 30000
+  max_pool_size: 100
+  min_pool_size: 1
+  max_idle_time: 300000
 
 graph:
   workflow_polling_time: 0.5
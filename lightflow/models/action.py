@@ -1,6 +1,3 @@
-from copy import copy
-
-
 class Action:
     """ The class for the action object that is returned by each task.
 
@@ -9,6 +6,8 @@ class Action:
     a list of immediate successor tasks that should be executed. The latter allows
     to limit the execution of successor tasks.
     """
+    __slots__ = ('_data', '_limit')
+
     def __init__(self, data, limit=None):
         """ Initialise the Action object.
 
@@ -32,5 +31,8 @@ class Action:
         return self._limit
 
     def copy(self):
-        """ Return a copy of the Action object. """
-        return copy(self)
+        """ Return a shallow copy of the Action object. """
+        new_action = Action.__new__(Action)
+        new_action._data = self._data
+        new_action._limit = self._limit
+        return new_action
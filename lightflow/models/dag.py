@@ -1,5 +1,6 @@
-from time import sleep
 import networkx as nx
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 
 from .task import BaseTask, TaskState
@@ -8,11 +9,18 @@ from .exceptions import (DirectedAcyclicGraphInvalid, DirectedAcyclicGraphUndefi
                          ConfigNotDefinedError)
 from lightflow.logger import get_logger
 from lightflow.queue.app import create_app
+from lightflow.queue.results import fetch_ready_results
 from lightflow.queue.const import JobExecPath, DefaultJobQueueName
 
 
+MAX_RESULT_CHECK_THREADS = 8
+
 logger = get_logger(__name__)
 
+# checks the results of running tasks concurrently, for result backends that do not
+# support fetching multiple results at once
+_result_check_executor = ThreadPoolExecutor(max_workers=MAX_RESULT_CHECK_THREADS)
+
 
 class Dag:
     """ A dag hosts a graph built from tasks and manages the task execution process.
@@ -45,6 +53,11 @@ class Dag:
         self._copy_counter = 0
         self._workflow_name = None
 
+        # whether the schema was validated when it was defined and whether the tasks
+        # in the schema are shared with a copy of the dag
+        self._is_validated = False
+        self._is_shared = False
+
     @property
     def name(self):
         """ Return the name of the dag. """
@@ -96,8 +109,11 @@ class Dag:
                              a directed acyclic graph.
         """
         self._schema = schema
+        self._is_validated = False
+        self._is_shared = False
         if validate:
             self.validate(self.make_graph(self._schema))
+            self._is_validated = True
 
     def run(self, config, workflow_id, signal, *, data=None):
         """ Run the dag by calling the tasks in the correct order.
@@ -114,10 +130,18 @@ class Dag:
             DirectedAcyclicGraphInvalid: If the graph is not a dag (e.g. contains loops).
             ConfigNotDefinedError: If the configuration for the dag is empty.
         """
-        graph = self.make_graph(self._schema)
+        # the tasks change their state while the dag runs, thus a dag that shares its
+        # tasks with a copy takes its own copy of the schema first
+        if self._is_shared:
+            self._schema = deepcopy(self._schema)
+            self._is_shared = False
 
-        # pre-checks
-        self.validate(graph)
+        schema = self._sanitize_schema(self._schema)
+
+        # pre-checks. A schema that was validated when it was defined is not checked
+        # again, as the check builds and traverses the whole graph.
+        if not self._is_validated:
+            self.validate(self.make_graph(self._schema))
 
         if config is None:
             raise ConfigNotDefinedError()
@@ -126,119 +150,143 @@ class Dag:
         celery_app = create_app(config)
 
         # the task queue for managing the current state of the tasks
-        tasks = []
+        task_queue = _TaskQueue(schema)
+        tasks = task_queue.tasks
         stopped = False
+        forget_results = celery_app.conf.result_expires == 0
+
+        # the names of the tasks that reported to have finished while the dag was
+        # waiting, or None if the state of all running tasks has to be checked
+        notified = None
 
-        # add all tasks without predecessors to the task list
-        for task in nx.topological_sort(graph):
+        # add all tasks without predecessors to the task list. The order of the
+        # remaining tasks follows from the dependency counters, so the graph does not
+        # have to be sorted topologically.
+        for task in task_queue.predecessors:
             task.workflow_name = self.workflow_name
             task.dag_name = self.name
-            if len(list(graph.predecessors(task))) == 0:
-                task.state = TaskState.Waiting
-                tasks.append(task)
-
-        def set_task_completed(completed_task):
-            """ For each completed task, add all successor tasks to the task list.
-            If they are not in the task list yet, flag them as 'waiting'.
-            """
-            completed_task.state = TaskState.Completed
-            for successor in graph.successors(completed_task):
-                if successor not in tasks:
-                    successor.state = TaskState.Waiting
-                    tasks.append(successor)
+            if task_queue.pending_predecessors[task] == 0:
+                task_queue.add_task(task)
+
+        # the tasks that are ready to run in the next pass
+        ready = deque(tasks)
 
         # process the task queue as long as there are tasks in it
         while tasks:
             if not stopped:
                 stopped = signal.is_stopped
 
-            # delay the execution by the polling time
-            if config.dag_polling_time > 0.0:
-                sleep(config.dag_polling_time)
-
-            for i in range(len(tasks) - 1, -1, -1):
-                task = tasks[i]
-
-                # for each waiting task, wait for all predecessor tasks to be
-                # completed. Then check whether the task should be skipped by
-                # interrogating the predecessor tasks.
+            # keep track of whether any task changed its state during this pass
+            progressed = False
+
+            # the tasks that are ready to run and are sent at the end of the pass
+            to_send = []
+
+            # check the running tasks with a single request to the result backend. If
+            # the dag was woken up by finished tasks, only those tasks are checked.
+            checked = [t for t in task_queue.running
+                       if notified is None or t.name in notified]
+            ready_ids = fetch_ready_results(
+                celery_app,
+                [t.celery_result for t in checked if t.has_celery_result],
+                executor=_result_check_executor)
+
+            # only the tasks whose state can change are visited: the ready tasks and the
+            # running tasks that are checked. Once the dag is stopped all tasks are
+            # visited, such that the waiting tasks are stopped. Successors that become
+            # ready during the pass are visited in the same pass, such that the whole
+            # next level of the dag is sent at once.
+            to_visit = deque(tasks) if stopped else ready
+            to_visit.extend(checked)
+            ready = deque()
+            while to_visit:
+                task = to_visit.popleft()
+
+                # a waiting task is only visited once all of its predecessor tasks
+                # completed, unless the dag is stopped. Check whether the task should
+                # be skipped by interrogating the predecessor tasks.
                 if task.is_waiting:
+                    progressed = True
                     if stopped:
-                        task.state = TaskState.Stopped
+                        task_queue.set_task_finished(task, TaskState.Stopped)
+                        continue
+
+                    # check whether the task should be skipped
+                    pre_tasks = task_queue.predecessors[task]
+                    run_task = task.has_to_run or len(pre_tasks) == 0
+                    for pre in pre_tasks:
+                        if run_task:
+                            break
+
+                        # predecessor task is skipped and flag should not be propagated
+                        if pre.is_skipped:
+                            run_task = not pre.propagate_skip
+                        else:
+                            # limits of a non-skipped predecessor task
+                            allowed = task_queue.allowed_successors(pre)
+                            run_task = allowed is None or task.name in allowed
+
+                    task.is_skipped = not run_task
+
+                    # send the task to celery or, if skipped, mark it as completed
+                    if task.is_skipped:
+                        to_visit.extend(task_queue.set_task_completed(task))
                     else:
-                        pre_tasks = list(graph.predecessors(task))
-                        if all([p.is_completed for p in pre_tasks]):
-
-                            # check whether the task should be skipped
-                            run_task = task.has_to_run or len(pre_tasks) == 0
-                            for pre in pre_tasks:
-                                if run_task:
-                                    break
-
-                                # predecessor task is skipped and flag should
-                                # not be propagated
-                                if pre.is_skipped and not pre.propagate_skip:
-                                    run_task = True
-
-                                # limits of a non-skipped predecessor task
-                                if not pre.is_skipped:
-                                    if pre.celery_result.result.limit is not None:
-                                        if task.name in [
-                                            n.name if isinstance(n, BaseTask) else n
-                                                for n in pre.celery_result.result.limit]:
-                                            run_task = True
-                                    else:
-                                        run_task = True
-
-                            task.is_skipped = not run_task
-
-                            # send the task to celery or, if skipped, mark it as completed
-                            if task.is_skipped:
-                                set_task_completed(task)
-                            else:
-                                # compose the input data from the predecessor tasks
-                                # output. Data from skipped predecessor tasks do not
-                                # contribute to the input data
-                                if len(pre_tasks) == 0:
-                                    input_data = data
-                                else:
-                                    input_data = MultiTaskData()
-                                    for pt in [p for p in pre_tasks if not p.is_skipped]:
-                                        slot = graph[pt][task]['slot']
-                                        input_data.add_dataset(
-                                            pt.name,
-                                            pt.celery_result.result.data.default_dataset,
-                                            aliases=[slot] if slot is not None else None)
-
-                                task.state = TaskState.Running
-                                task.celery_result = celery_app.send_task(
-                                    JobExecPath.Task,
-                                    args=(task, workflow_id, input_data),
-                                    queue=task.queue,
-                                    routing_key=task.queue
-                                )
+                        task_queue.set_task_running(task)
+                        to_send.append(task)
 
                 # flag task as completed
                 elif task.is_running:
+                    if notified is not None and task.name not in notified:
+                        continue
+
+                    if ready_ids is not None and task.has_celery_result and \
+                            task.celery_result.id not in ready_ids:
+                        continue
+
                     if task.celery_completed:
-                        set_task_completed(task)
+                        to_visit.extend(task_queue.set_task_completed(task))
+                        progressed = True
                     elif task.celery_failed:
-                        task.state = TaskState.Aborted
+                        task_queue.set_task_finished(task, TaskState.Aborted)
                         signal.stop_workflow()
-
-                # cleanup task results that are not required anymore
-                elif task.is_completed:
-                    if all([s.is_completed or s.is_stopped or s.is_aborted
-                            for s in graph.successors(task)]):
-                        if celery_app.conf.result_expires == 0:
-                            task.clear_celery_result()
-                        tasks.remove(task)
-
-                # cleanup and remove stopped and aborted tasks
-                elif task.is_stopped or task.is_aborted:
-                    if celery_app.conf.result_expires == 0:
-                        task.clear_celery_result()
-                    tasks.remove(task)
+                        progressed = True
+
+            # remove the tasks that finished and whose results are not required anymore
+            # from the task list
+            removed = task_queue.remove_finished()
+
+            # send all tasks that are ready to run using a single broker connection. The
+            # tasks with the most successors are sent first, as they unlock the most
+            # work. The input data of a task is only composed right before it is sent.
+            if len(to_send) > 0:
+                to_send.sort(key=lambda t: len(task_queue.successors[t]), reverse=True)
+                with celery_app.producer_or_acquire() as producer:
+                    for task in to_send:
+                        task.celery_result = celery_app.send_task(
+                            JobExecPath.Task,
+                            args=(task, workflow_id, task_queue.input_data(task, data)),
+                            queue=task.queue,
+                            routing_key=task.queue,
+                            producer=producer
+                        )
+
+            # remove the results of finished tasks only after the new tasks were sent,
+            # such that the cleanup does not delay the start of the next tasks
+            if forget_results:
+                for task in removed:
+                    task.clear_celery_result()
+
+            # unless the tasks progressed, wait for a task to finish. The polling time
+            # limits the wait, such that a stop signal is still picked up. If the wait
+            # timed out, all running tasks are checked in case a notification was lost.
+            notified = None
+            if tasks and not progressed:
+                finished = signal.wait_for_tasks(config.dag_polling_time)
+                if len(finished) > 0:
+                    notified = set(finished)
+
+        signal.clear_tasks()
 
     def validate(self, graph):
         """ Validate the graph by checking whether it is a directed acyclic graph.
@@ -285,37 +333,64 @@ class Dag:
         if schema is None:
             raise DirectedAcyclicGraphUndefined()
 
-        # sanitize the input schema such that it follows the structure:
-        #    {parent: {child_1: slot_1, child_2: slot_2, ...}, ...}
+        # build the graph in a single pass over the schema. The children are handled
+        # following the same rules as in _sanitize_schema, without building the
+        # sanitized schema first.
+        graph = nx.DiGraph()
+        add_edge = graph.add_edge
+        for parent, children in schema.items():
+            if isinstance(children, dict):
+                for child, slot in children.items():
+                    add_edge(parent, child, slot=slot if slot != '' else None)
+            elif isinstance(children, (list, tuple, set)):
+                for child in children:
+                    add_edge(parent, child, slot=None)
+            elif children is not None:
+                add_edge(parent, children, slot=None)
+                continue
+
+            # parents without any children
+            if children is None or len(children) == 0:
+                graph.add_node(parent)
+
+        return graph
+
+    @staticmethod
+    def _sanitize_schema(schema):
+        """ Sanitize a schema such that it follows the structure:
+            {parent: {child_1: slot_1, child_2: slot_2, ...}, ...}
+
+        A parent without children maps to {None: None}.
+
+        Args:
+            schema (dict): A dictionary with the schema definition.
+
+        Returns:
+            dict: The sanitized schema.
+
+        Raises:
+            DirectedAcyclicGraphUndefined: If the schema is not defined.
+        """
+        if schema is None:
+            raise DirectedAcyclicGraphUndefined()
+
+        # the shape of the children is checked once per parent, the edges are then
+        # copied without any further checks
         sanitized_schema = {}
         for parent, children in schema.items():
-            child_dict = {}
-            if children is not None:
-                if isinstance(children, list):
-                    if len(children) > 0:
-                        child_dict = {child: None for child in children}
-                    else:
-                        child_dict = {None: None}
-                elif isinstance(children, dict):
-                    for child, slot in children.items():
-                        child_dict[child] = slot if slot != '' else None
-                else:
-                    child_dict = {children: None}
+            if isinstance(children, dict):
+                child_dict = {child: slot if slot != '' else None
+                              for child, slot in children.items()}
+            elif isinstance(children, (list, tuple, set)):
+                child_dict = dict.fromkeys(children)
+            elif children is not None:
+                child_dict = {children: None}
             else:
-                child_dict = {None: None}
+                child_dict = {}
 
-            sanitized_schema[parent] = child_dict
+            sanitized_schema[parent] = child_dict if len(child_dict) > 0 else {None: None}
 
-        # build the graph from the sanitized schema
-        graph = nx.DiGraph()
-        for parent, children in sanitized_schema.items():
-            for child, slot in children.items():
-                if child is not None:
-                    graph.add_edge(parent, child, slot=slot)
-                else:
-                    graph.add_node(parent)
-
-        return graph
+        return sanitized_schema
 
     def __deepcopy__(self, memo):
         """ Create a copy of the dag object.
@@ -323,6 +398,11 @@ class Dag:
         This method keeps track of the number of copies that have been made. The number is
         appended to the name of the copy.
 
+        The copy shares the schema with the original dag. The tasks in the schema are
+        only copied when one of the dags is run in the same process, as dags are usually
+        pickled and sent to a worker right after they were copied, which copies the
+        tasks anyway.
+
         Args:
             memo (dict): a dictionary that keeps track of the objects that
                          have already been copied.
@@ -333,5 +413,231 @@ class Dag:
         self._copy_counter += 1
         new_dag = Dag('{}:{}'.format(self._name, self._copy_counter),
                       autostart=self._autostart, queue=self._queue)
-        new_dag._schema = deepcopy(self._schema, memo)
+        new_dag._schema = self._schema
+        new_dag._is_validated = self._is_validated
+        new_dag._is_shared = self._is_shared = True
         return new_dag
+
+    def __getstate__(self):
+        """ Return the state of the dag for pickling.
+
+        An unpickled dag owns the tasks in its schema, so it is not flagged as sharing
+        them.
+
+        Returns:
+            dict: The attributes of the dag.
+        """
+        state = self.__dict__.copy()
+        state['_is_shared'] = False
+        return state
+
+
+class _TaskQueue:
+    """ The queue of tasks that are processed while a dag is running.
+
+    The predecessors, successors and input slots of each task are read from the
+    schema once. Together with the number of unfinished predecessors and successors of
+    each task, they allow the dag to follow the progress of its tasks without building
+    or walking a graph.
+
+    The task list and the running tasks are kept as dicts with the tasks as keys, which
+    keeps the order in which the tasks were added and allows removing a task directly.
+    A task that finished is collected as soon as none of its successors needs its
+    result anymore, so the dag never has to look at it again.
+
+    Args:
+        schema (dict): The sanitized schema of the dag, as returned by _sanitize_schema.
+    """
+    __slots__ = ('tasks', 'running', 'predecessors', 'successors', 'input_slots',
+                 'pending_predecessors', 'pending_successors', '_finished',
+                 '_allowed_successors', '_results')
+
+    def __init__(self, schema):
+        self.tasks = {}
+        self.running = {}
+        self._finished = []
+        self._allowed_successors = {}
+        self._results = {}
+
+        # the adjacency of the tasks in the order the tasks appear in the schema
+        pred = {}
+        succ = {}
+        for parent, children in schema.items():
+            pred.setdefault(parent, {})
+            succ.setdefault(parent, [])
+            for child, slot in children.items():
+                if child is not None:
+                    pred.setdefault(child, {})[parent] = slot
+                    succ.setdefault(child, [])
+                    succ[parent].append(child)
+
+        # the predecessors of each task together with the slot their data is routed to.
+        # The tables are stored as tuples, which are cheap to iterate.
+        self.input_slots = {task: tuple(pre_tasks.items())
+                            for task, pre_tasks in pred.items()}
+
+        # the predecessors and successors of each task and, for each task, the number
+        # of predecessors that have not completed yet
+        self.predecessors = {task: tuple(pre_tasks) for task, pre_tasks in pred.items()}
+        self.successors = {task: tuple(succ_tasks) for task, succ_tasks in succ.items()}
+        self.pending_predecessors = {task: len(pre_tasks)
+                                     for task, pre_tasks in self.predecessors.items()}
+
+        # for each task, the number of successors that have not finished yet
+        self.pending_successors = {task: len(succ_tasks)
+                                   for task, succ_tasks in self.successors.items()}
+
+    def allowed_successors(self, task):
+        """ Return the names of the successor tasks a completed task allows to run.
+
+        The names are read from the limit of the task's result once and then reused for
+        all of its successor tasks.
+
+        Args:
+            task (BaseTask): The task that completed.
+
+        Returns:
+            set: The names of the successor tasks that should be run, or None if the
+                task does not limit its successor tasks.
+        """
+        try:
+            return self._allowed_successors[task]
+        except KeyError:
+            limit = self.result(task).limit
+            allowed = None if limit is None else \
+                {n.name if isinstance(n, BaseTask) else n for n in limit}
+            self._allowed_successors[task] = allowed
+            return allowed
+
+    def result(self, task):
+        """ Return the result of a completed task.
+
+        The result is read from the celery result of the task once and then reused for
+        the limits and the data of the task.
+
+        Args:
+            task (BaseTask): The task that completed.
+
+        Returns:
+            Action: The action object the task returned.
+        """
+        try:
+            return self._results[task]
+        except KeyError:
+            result = self._results[task] = task.celery_result.result
+            return result
+
+    def input_data(self, task, data):
+        """ Compose the input data of a task from the output of its predecessor tasks.
+
+        Data from skipped predecessor tasks do not contribute to the input data.
+
+        Args:
+            task (BaseTask): The task that is about to be sent.
+            data (MultiTaskData): The initial data of the dag, which is passed on to the
+                                  tasks without predecessors.
+
+        Returns:
+            MultiTaskData: The input data of the task.
+        """
+        slots = self.input_slots[task]
+        if len(slots) == 0:
+            return data
+
+        if len(slots) == 1 and not slots[0][0].is_skipped:
+            pre, slot = slots[0]
+            return MultiTaskData.from_single(
+                pre.name, self.result(pre).data.default_dataset, alias=slot)
+
+        slots = [entry for entry in slots if not entry[0].is_skipped]
+        return MultiTaskData.from_datasets(
+            [pre.name for pre, _ in slots],
+            [self.result(pre).data.default_dataset for pre, _ in slots],
+            [slot for _, slot in slots])
+
+    def add_task(self, task):
+        """ Flag a task as waiting and add it to the task list.
+
+        Args:
+            task (BaseTask): The task that is added.
+        """
+        task.state = TaskState.Waiting
+        self.tasks[task] = None
+
+    def set_task_running(self, task):
+        """ Flag a task as running and add it to the running tasks.
+
+        Args:
+            task (BaseTask): The task that is about to be sent.
+        """
+        task.state = TaskState.Running
+        self.running[task] = None
+
+    def set_task_finished(self, task, state):
+        """ Set the final state of a task and count it as a finished successor of its
+        predecessor tasks.
+
+        A task that did not complete, or completed without unfinished successors, is
+        collected for removal right away. A completed predecessor task is collected once
+        its last successor finished.
+
+        Args:
+            task (BaseTask): The task that finished.
+            state (str): The final state of the task.
+        """
+        task.state = state
+        self.running.pop(task, None)
+
+        pending_successors = self.pending_successors
+        if state != TaskState.Completed or pending_successors[task] == 0:
+            self._finished.append(task)
+
+        for pre in self.predecessors[task]:
+            pending = pending_successors[pre] - 1
+            pending_successors[pre] = pending
+            if pending == 0 and pre.state == TaskState.Completed:
+                self._finished.append(pre)
+
+    def remove_finished(self):
+        """ Remove the collected finished tasks from the task list.
+
+        Returns:
+            list: The tasks that were removed.
+        """
+        finished = self._finished
+        self._finished = []
+        for task in finished:
+            del self.tasks[task]
+        return finished
+
+    def set_task_completed(self, task):
+        """ Flag a task as completed and add its successor tasks to the task list.
+
+        Successor tasks that have not been queued yet are flagged as 'waiting' and added
+        to the task list. As the state of a task only leaves 'init' when it is added,
+        each task is added exactly once, even if it was stopped and removed from the
+        task list before all of its predecessors completed.
+
+        Args:
+            task (BaseTask): The task that completed.
+
+        Returns:
+            list: The successor tasks whose predecessors have all completed.
+        """
+        self.set_task_finished(task, TaskState.Completed)
+
+        # the counters and the task list are bound to locals, as this loop runs for
+        # every edge of the dag
+        pending_predecessors = self.pending_predecessors
+        tasks = self.tasks
+        ready_tasks = []
+        for successor in self.successors[task]:
+            pending = pending_predecessors[successor] - 1
+            pending_predecessors[successor] = pending
+            state = successor.state
+            if state == TaskState.Init:
+                successor.state = state = TaskState.Waiting
+                tasks[successor] = None
+            if pending == 0 and state == TaskState.Waiting:
+                ready_tasks.append(successor)
+        return ready_tasks
@@ -1,17 +1,84 @@
+from time import sleep
+
 from .signal import Request
 
+# the event that is pushed onto the task event queue of a dag to wake it up when it is
+# stopped. The name is reserved and must not be used as the name of a task.
+DAG_STOP_EVENT = 'lightflow:stop'
+
+
+def task_events_key(workflow_id, dag_name):
+    """ Return the key of the event queue that collects the finished tasks of a dag.
+
+    Args:
+        workflow_id (str): The unique ID of the workflow run the dag belongs to.
+        dag_name (str): The name of the dag.
+
+    Returns:
+        str: The key of the event queue.
+    """
+    return '{}:{}:task_events'.format(workflow_id, dag_name)
+
+
+def stop_flag_key(workflow_id, dag_name):
+    """ Return the key of the flag that signals the tasks of a dag to stop.
+
+    Args:
+        workflow_id (str): The unique ID of the workflow run the dag belongs to.
+        dag_name (str): The name of the dag.
+
+    Returns:
+        str: The key of the stop flag.
+    """
+    return '{}:{}:stopped'.format(workflow_id, dag_name)
+
 
 class DagSignal:
     """ Class to wrap the construction and sending of signals into easy to use methods """
-    def __init__(self, client, dag_name):
+    def __init__(self, client, dag_name, *, task_events=None, stop_flag=None):
         """ Initialise the dag signal convenience class.
 
         Args:
             client (Client): A reference to a signal client object.
             dag_name (str): The name of the dag sending this signal.
+            task_events (EventQueue): An optional event queue onto which the names of
+                                      the tasks of the dag are pushed when they finish.
+            stop_flag (StopFlag): An optional flag that is set by the workflow when the
+                                  dag is stopped.
         """
         self._client = client
         self._dag_name = dag_name
+        self._task_events = task_events
+        self._stop_flag = stop_flag
+
+        # the payload of the stop check is built once. The request itself is created
+        # for every call, as its unique id tags the response of the server.
+        self._is_stopped_payload = {'dag_name': dag_name}
+
+    def wait_for_tasks(self, timeout):
+        """ Wait until one or more tasks of the dag finished running.
+
+        Without an event queue for the tasks this sleeps for the full timeout. The wait
+        also ends early when the workflow stops the dag.
+
+        Args:
+            timeout (float): The maximum time to wait in seconds.
+
+        Returns:
+            list: The names of the tasks that finished running.
+        """
+        if self._task_events is None:
+            if timeout > 0.0:
+                sleep(timeout)
+            return []
+
+        return [name for name in self._task_events.wait(timeout)
+                if name != DAG_STOP_EVENT]
+
+    def clear_tasks(self):
+        """ Remove any pending task events of the dag. """
+        if self._task_events is not None:
+            self._task_events.clear()
 
     def stop_workflow(self):
         """ Send a stop signal to the workflow.
@@ -33,13 +100,15 @@ class DagSignal:
         As soon as the dag receives a stop signal, no new tasks will be queued
         and the dag will wait for the active tasks to terminate.
 
+        If a stop flag is available it is checked directly, instead of sending a
+        request to the workflow and waiting for its response.
+
         Returns:
             bool: True if the dag should be stopped.
         """
+        if self._stop_flag is not None:
+            return self._stop_flag.is_set
+
         resp = self._client.send(
-            Request(
-                action='is_dag_stopped',
-                payload={'dag_name': self._dag_name}
-            )
-        )
+            Request(action='is_dag_stopped', payload=self._is_stopped_payload))
         return resp.payload['is_stopped']
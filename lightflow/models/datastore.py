@@ -1,8 +1,10 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 from pymongo.errors import ConnectionFailure
 from bson.binary import Binary
 from bson.objectid import ObjectId
+import time
 import pickle
+from contextlib import contextmanager
 from datetime import datetime
 from gridfs import GridFS
 from urllib.parse import quote_plus
@@ -16,6 +18,17 @@ logger = get_logger(__name__)
 
 WORKFLOW_DATA_COLLECTION_NAME = 'workflow-data'
 
+# the time in seconds a successful connection check remains valid
+CONNECTION_CHECK_TTL = 5.0
+
+# the types of the values that are stored directly in MongoDB
+PRIMITIVE_TYPES = (int, float, str, bool, datetime)
+_PRIMITIVE_TYPE_SET = frozenset(PRIMITIVE_TYPES)
+
+# the pickle protocol for values stored in GridFS. Protocol 4 is binary, frames large
+# objects and can be read by all supported Python versions.
+PICKLE_PROTOCOL = 4
+
 
 class DataStoreDocumentSection:
     """ The different sections the data store document contains """
@@ -47,12 +60,19 @@ class DataStore:
         auth_mechanism (str): The authentication mechanism.
         connect_timeout (int): The timeout in ms after which a connection
             attempt is ended.
+        max_pool_size (int): The maximum number of connections to MongoDB that are kept
+            in the connection pool.
+        min_pool_size (int): The number of connections to MongoDB that are kept open in
+            the connection pool, even if they are idle.
+        max_idle_time (int): The time in ms after which an idle connection is removed
+            from the connection pool. If None, idle connections are kept open.
         auto_connect (bool): Set to True to connect to the MongoDB database immediately.
         handle_reconnect (bool): Set to True to automatically reconnect to MongoDB should
             the connection be lost.
     """
     def __init__(self, host, port, database, *, username=None, password=None,
                  auth_source='admin', auth_mechanism=None, connect_timeout=30000,
+                 max_pool_size=100, min_pool_size=0, max_idle_time=None,
                  auto_connect=False, handle_reconnect=True):
         self.host = host
         self.port = port
@@ -64,9 +84,13 @@ class DataStore:
         self._auth_mechanism = auth_mechanism
 
         self._connect_timeout = connect_timeout
+        self._max_pool_size = max_pool_size
+        self._min_pool_size = min_pool_size
+        self._max_idle_time = max_idle_time
         self._handle_reconnect = handle_reconnect
 
         self._client = None
+        self._connection_checked_at = None
         if auto_connect:
             self.connect()
 
@@ -84,18 +108,30 @@ class DataStore:
     def is_connected(self):
         """ Returns the connection status of the data store.
 
+        The connection is checked by sending a ping to the MongoDB server. A successful
+        check is remembered for a few seconds, such that repeated checks are answered
+        locally.
+
         Returns:
             bool: ``True`` if the data store is connected to the MongoDB server.
         """
-        if self._client is not None:
-            try:
-                self._client.server_info()
-            except ConnectionFailure:
-                return False
+        if self._client is None:
+            return False
+
+        now = time.monotonic()
+        if self._connection_checked_at is not None and \
+                now - self._connection_checked_at <= CONNECTION_CHECK_TTL:
             return True
-        else:
+
+        try:
+            self._client.admin.command('ping')
+        except ConnectionFailure:
+            self._connection_checked_at = None
             return False
 
+        self._connection_checked_at = now
+        return True
+
     def connect(self):
         """ Establishes a connection to the MongoDB server.
 
@@ -108,13 +144,17 @@ class DataStore:
             'username': self._username,
             'password': self._password,
             'authSource': self._auth_source,
-            'serverSelectionTimeoutMS': self._connect_timeout
+            'serverSelectionTimeoutMS': self._connect_timeout,
+            'maxPoolSize': self._max_pool_size,
+            'minPoolSize': self._min_pool_size,
+            'maxIdleTimeMS': self._max_idle_time
         }
 
         if self._auth_mechanism is not None:
             mongodb_args['authMechanism'] = self._auth_mechanism
 
         self._client = MongoClient(**mongodb_args)
+        self._connection_checked_at = None
 
         if self._handle_reconnect:
             self._client = MongoClientProxy(self._client)
@@ -123,6 +163,7 @@ class DataStore:
         """ Disconnect from the MongoDB server. """
         if self._client is not None:
             self._client.close()
+        self._connection_checked_at = None
 
     @property
     def server_info(self):
@@ -151,7 +192,7 @@ class DataStore:
         try:
             db = self._client[self.database]
             col = db[WORKFLOW_DATA_COLLECTION_NAME]
-            return col.find_one({"_id": ObjectId(workflow_id)}) is not None
+            return col.find_one({"_id": ObjectId(workflow_id)}, {"_id": 1}) is not None
 
         except ConnectionFailure:
             raise DataStoreNotConnected()
@@ -245,6 +286,43 @@ class DataStoreDocument:
         self._gridfs = grid_fs
         self._workflow_id = workflow_id
 
+        # the query selecting the document, built once for all reads and writes
+        self._query = {"_id": ObjectId(workflow_id)}
+
+        # the updates queued while in a batch, or None if not in a batch
+        self._batch = None
+
+    @contextmanager
+    def batch(self):
+        """ Queue all changes to the document and write them with a single request.
+
+        The set, push and extend methods called within the context are sent to MongoDB
+        together when the context is left, which saves a round trip for each change.
+        They return ``True`` as soon as the change was queued. Values that are read
+        within the context, including the lookup of linked GridFS data by set, are
+        read from the stored document and do not see the queued changes. If the context
+        is left with an exception, the queued changes are discarded.
+
+        Raises:
+            DataStoreNotConnected: If the data store is not connected to the server.
+        """
+        if self._batch is not None:
+            yield self
+            return
+
+        self._batch = []
+        try:
+            yield self
+            updates = self._batch
+        finally:
+            self._batch = None
+
+        if len(updates) > 0:
+            try:
+                self._collection.bulk_write(updates, ordered=True)
+            except ConnectionFailure:
+                raise DataStoreNotConnected()
+
     def get(self, key, default=None, *, section=DataStoreDocumentSection.Data):
         """ Return the field specified by its key from the specified section.
 
@@ -294,16 +372,12 @@ class DataStoreDocument:
         except KeyError:
             logger.info('Adding new field {} to the data store'.format(key_notation))
 
-        result = self._collection.update_one(
-            {"_id": ObjectId(self._workflow_id)},
-            {
-                "$set": {
-                    key_notation: self._encode_value(value)
-                },
-                "$currentDate": {"lastModified": True}
-            }
-        )
-        return result.modified_count == 1
+        return self._update({
+            "$set": {
+                key_notation: self._encode_value(value)
+            },
+            "$currentDate": {"lastModified": True}
+        })
 
     def push(self, key, value, *, section=DataStoreDocumentSection.Data):
         """ Appends a value to a list in the specified section of the document.
@@ -319,16 +393,12 @@ class DataStoreDocument:
             bool: ``True`` if the value could be appended, otherwise ``False``.
         """
         key_notation = '.'.join([section, key])
-        result = self._collection.update_one(
-            {"_id": ObjectId(self._workflow_id)},
-            {
-                "$push": {
-                    key_notation: self._encode_value(value)
-                },
-                "$currentDate": {"lastModified": True}
-            }
-        )
-        return result.modified_count == 1
+        return self._update({
+            "$push": {
+                key_notation: self._encode_value(value)
+            },
+            "$currentDate": {"lastModified": True}
+        })
 
     def extend(self, key, values, *, section=DataStoreDocumentSection.Data):
         """ Extends a list in the data store with the elements of values.
@@ -349,20 +419,35 @@ class DataStoreDocument:
         if not isinstance(values, list):
             return False
 
-        result = self._collection.update_one(
-            {"_id": ObjectId(self._workflow_id)},
-            {
-                "$push": {
-                    key_notation: {"$each": self._encode_value(values)}
-                },
-                "$currentDate": {"lastModified": True}
-            }
-        )
-        return result.modified_count == 1
+        return self._update({
+            "$push": {
+                key_notation: {"$each": self._encode_value(values)}
+            },
+            "$currentDate": {"lastModified": True}
+        })
+
+    def _update(self, update):
+        """ Apply an update to the document or queue it if in a batch.
+
+        Args:
+            update (dict): The MongoDB update operations.
+
+        Returns:
+            bool: ``True`` if the document was updated or the update was queued,
+                otherwise ``False``.
+        """
+        if self._batch is not None:
+            self._batch.append(UpdateOne(self._query, update))
+            return True
+
+        return self._collection.update_one(self._query, update).modified_count == 1
 
     def _data_from_dotnotation(self, key, default=None):
         """ Returns the MongoDB data from a key using dot notation.
 
+        Only the field the key is pointing to is fetched from MongoDB, instead of the
+        whole workflow document.
+
         Args:
             key (str): The key to the field in the workflow document. Supports MongoDB's
                 dot notation for embedded fields.
@@ -375,7 +460,7 @@ class DataStoreDocument:
         if key is None:
             raise KeyError('NoneType is not a valid key!')
 
-        doc = self._collection.find_one({"_id": ObjectId(self._workflow_id)})
+        doc = self._collection.find_one(self._query, {key: 1, "_id": 0})
         if doc is None:
             return default
 
@@ -397,17 +482,23 @@ class DataStoreDocument:
         Returns:
             object: The encoded value ready to be stored in MongoDB.
         """
-        if isinstance(value, (int, float, str, bool, datetime)):
+        # lists and dicts holding only primitive items are stored as they are. Otherwise
+        # their primitive items are copied without a recursive call, as they make up
+        # most of the data.
+        if isinstance(value, PRIMITIVE_TYPES):
             return value
         elif isinstance(value, list):
-            return [self._encode_value(item) for item in value]
+            if _PRIMITIVE_TYPE_SET.issuperset(map(type, value)):
+                return value
+            return [item if isinstance(item, PRIMITIVE_TYPES) else self._encode_value(item)
+                    for item in value]
         elif isinstance(value, dict):
-            result = {}
-            for key, item in value.items():
-                result[key] = self._encode_value(item)
-            return result
+            if _PRIMITIVE_TYPE_SET.issuperset(map(type, value.values())):
+                return value
+            return {key: item if isinstance(item, PRIMITIVE_TYPES)
+                    else self._encode_value(item) for key, item in value.items()}
         else:
-            return self._gridfs.put(Binary(pickle.dumps(value)),
+            return self._gridfs.put(Binary(pickle.dumps(value, protocol=PICKLE_PROTOCOL)),
                                     workflow_id=self._workflow_id)
 
     def _decode_value(self, value):
@@ -427,15 +518,14 @@ class DataStoreDocument:
         Returns:
             object: The decoded value as a valid Python object.
         """
-        if isinstance(value, (int, float, str, bool, datetime)):
+        if isinstance(value, PRIMITIVE_TYPES):
             return value
         elif isinstance(value, list):
-            return [self._decode_value(item) for item in value]
+            return [item if isinstance(item, PRIMITIVE_TYPES) else self._decode_value(item)
+                    for item in value]
         elif isinstance(value, dict):
-            result = {}
-            for key, item in value.items():
-                result[key] = self._decode_value(item)
-            return result
+            return {key: item if isinstance(item, PRIMITIVE_TYPES)
+                    else self._decode_value(item) for key, item in value.items()}
         elif isinstance(value, ObjectId):
             if self._gridfs.exists({"_id": value}):
                 return pickle.loads(self._gridfs.get(value).read())
@@ -1,6 +1,48 @@
 from .exceptions import WorkflowArgumentError
 
 
+def _convert_int(value):
+    """ Convert a value to an integer. """
+    try:
+        return int(value)
+    except (UnicodeError, ValueError):
+        raise WorkflowArgumentError('Cannot convert {} to int'.format(value))
+
+
+def _convert_float(value):
+    """ Convert a value to a float. """
+    try:
+        return float(value)
+    except (UnicodeError, ValueError):
+        raise WorkflowArgumentError('Cannot convert {} to float'.format(value))
+
+
+def _convert_bool(value):
+    """ Convert a boolean or a string such as 'yes' or 'false' to a boolean. """
+    if isinstance(value, bool):
+        return bool(value)
+    value = value.lower()
+    if value in ('true', '1', 'yes', 'y'):
+        return True
+    elif value in ('false', '0', 'no', 'n'):
+        return False
+    raise WorkflowArgumentError('Cannot convert {} to bool'.format(value))
+
+
+def _convert_none(value):
+    """ Return the value unchanged for types without a conversion. """
+    return value
+
+
+# the conversion function for each supported option type
+_CONVERTERS = {
+    str: str,
+    int: _convert_int,
+    float: _convert_float,
+    bool: _convert_bool
+}
+
+
 class Option:
     """ A single option which is required to run the workflow.
 
@@ -8,6 +50,8 @@ class Option:
     if available, its provided value is stored in the data store for use within
     the workflow.
     """
+    __slots__ = ('_name', '_default', '_help', '_type', '_convert')
+
     def __init__(self, name, default=None, help=None, type=str):
         """ Initialise the workflow option.
 
@@ -22,6 +66,7 @@ class Option:
         self._default = default
         self._help = help
         self._type = type
+        self._convert = _CONVERTERS.get(type, _convert_none)
 
     @property
     def name(self):
@@ -68,34 +113,41 @@ class Option:
         Returns:
             The value with the type given by the option.
         """
-        if self._type is str:
-            return str(value)
-        elif self._type is int:
-            try:
-                return int(value)
-            except (UnicodeError, ValueError):
-                raise WorkflowArgumentError('Cannot convert {} to int'.format(value))
-        elif self._type is float:
-            try:
-                return float(value)
-            except (UnicodeError, ValueError):
-                raise WorkflowArgumentError('Cannot convert {} to float'.format(value))
-        elif self._type is bool:
-            if isinstance(value, bool):
-                return bool(value)
-            value = value.lower()
-            if value in ('true', '1', 'yes', 'y'):
-                return True
-            elif value in ('false', '0', 'no', 'n'):
-                return False
-            raise WorkflowArgumentError('Cannot convert {} to bool'.format(value))
-        else:
-            return value
+        return self._convert(value)
 
 
 class Parameters(list):
     """ A list of options that the workflow requires in order to run. """
 
+    def process(self, args):
+        """ Check and consolidate the provided arguments in a single pass.
+
+        All options that don't have a default value are required in order to run the
+        workflow. If the provided arguments have matching options, this performs a type
+        conversion. For any option that has a default value and is not present in the
+        provided arguments, the default value is added.
+
+        Args:
+            args (dict): A dictionary of the provided arguments.
+
+        Returns:
+            tuple: A list with the names of the options that are missing from the
+                   provided arguments and a dictionary with the type converted and with
+                   default options enriched arguments.
+        """
+        missing = []
+        result = dict(args)
+
+        for opt in self:
+            if opt.name in result:
+                result[opt.name] = opt.convert(result[opt.name])
+            elif opt.default is not None:
+                result[opt.name] = opt.convert(opt.default)
+            else:
+                missing.append(opt.name)
+
+        return missing, result
+
     def check_missing(self, args):
         """ Returns the names of all options that are required but were not specified.
 
@@ -127,13 +179,4 @@ class Parameters(list):
             dict: A dictionary with the type converted and with default options enriched
                   arguments.
         """
-        result = dict(args)
-
-        for opt in self:
-            if opt.name in result:
-                result[opt.name] = opt.convert(result[opt.name])
-            else:
-                if opt.default is not None:
-                    result[opt.name] = opt.convert(opt.default)
-
-        return result
+        return self.process(args)[1]
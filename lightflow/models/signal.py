@@ -1,9 +1,11 @@
+import math
 import pickle
 import uuid
 from time import sleep
 from redis import StrictRedis
 
 SIGNAL_REDIS_PREFIX = 'lightflow'
+SIGNAL_EVENT_EXPIRY = 86400
 
 
 class SignalConnection:
@@ -137,6 +139,11 @@ class Server:
         self._connection.connection.set('{}:{}'.format(SIGNAL_REDIS_PREFIX, response.uid),
                                         pickle.dumps(response))
 
+    @property
+    def connection(self):
+        """ Returns the signal connection object of the server. """
+        return self._connection
+
     def restore(self, request):
         """ Push the request back onto the queue.
 
@@ -190,3 +197,100 @@ class Client:
                 break
 
         return pickle.loads(response_data)
+
+
+class EventQueue:
+    """ A queue of events that one side pushes and the other side waits for.
+
+    This implementation stores the events as strings in a list in redis. Waiting for
+    events blocks on the list, such that the waiting side wakes up as soon as an event
+    was pushed instead of polling. The list expires after a day, in case the waiting
+    side never removes it.
+    """
+    def __init__(self, connection, key):
+        """ Initialises the event queue.
+
+        Args:
+            connection: Reference to a signal connection object.
+            key (str): The key under which the list of events is stored.
+        """
+        self._connection = connection
+        self._key = '{}:{}'.format(SIGNAL_REDIS_PREFIX, key)
+
+    def push(self, event):
+        """ Push a new event onto the queue.
+
+        Args:
+            event (str): The event that should be pushed.
+        """
+        pipe = self._connection.connection.pipeline()
+        pipe.rpush(self._key, event)
+        pipe.expire(self._key, SIGNAL_EVENT_EXPIRY)
+        pipe.execute()
+
+    def wait(self, timeout):
+        """ Wait for events and return all events that are available.
+
+        Args:
+            timeout (float): The maximum time to wait for an event in seconds. It is
+                             rounded up to full seconds, as redis servers older than
+                             version 6 only accept whole seconds. This only delays the
+                             fallback polling, as finished tasks push an event that ends
+                             the wait immediately. If it is zero, the available events
+                             are returned without waiting.
+
+        Returns:
+            list: The events in the order they were pushed. The list is empty if no
+                  event arrived before the timeout.
+        """
+        events = []
+        if timeout > 0.0:
+            first = self._connection.connection.blpop(self._key,
+                                                      timeout=int(math.ceil(timeout)))
+            if first is None:
+                return events
+            events.append(first[1])
+
+        pipe = self._connection.connection.pipeline()
+        pipe.lrange(self._key, 0, -1)
+        pipe.delete(self._key)
+        remaining, _ = pipe.execute()
+
+        events.extend(remaining)
+        return [e.decode() if isinstance(e, bytes) else e for e in events]
+
+    def clear(self):
+        """ Deletes the list of events from the redis database. """
+        self._connection.connection.delete(self._key)
+
+
+class StopFlag:
+    """ A flag that signals to the tasks of a dag that they should stop.
+
+    The flag is stored as a key in redis that is set by the workflow when the dag is
+    stopped. Checking the flag is a single lookup, instead of a request that has to wait
+    for the workflow to respond. The key expires after a day, in case the workflow
+    never removes it.
+    """
+    def __init__(self, connection, key):
+        """ Initialises the stop flag.
+
+        Args:
+            connection: Reference to a signal connection object.
+            key (str): The key under which the flag is stored.
+        """
+        self._connection = connection
+        self._key = '{}:{}'.format(SIGNAL_REDIS_PREFIX, key)
+
+    @property
+    def is_set(self):
+        """ Returns whether the flag has been set. """
+        return self._connection.connection.exists(self._key) > 0
+
+    def set(self):
+        """ Set the flag. """
+        self._connection.connection.set(self._key, 1, ex=SIGNAL_EVENT_EXPIRY)
+
+    def clear(self):
+        """ Deletes the flag from the redis database. """
+        self._connection.connection.delete(self._key)
@@ -1,3 +1,5 @@
+from celery import states
+
 from .action import Action
 from .task_data import MultiTaskData
 from .exceptions import TaskReturnActionInvalid, AbortWorkflow, StopTask
@@ -26,7 +28,13 @@ class BaseTask:
     """ The base class for all tasks.
 
     Tasks should inherit from this class and implement the run() method.
+    Subclasses that declare __slots__ for their own attributes avoid the per-instance
+    dictionary, which keeps the memory footprint of large dags small.
     """
+    __slots__ = ('_name', '_queue', '_callback_init', '_callback_finally', '_force_run',
+                 '_propagate_skip', '_skip', '_state', '_celery_result',
+                 '_celery_ready_state', 'workflow_name', 'dag_name')
+
     def __init__(self, name, *, queue=DefaultJobQueueName.Task,
                  callback_init=None, callback_finally=None,
                  force_run=False, propagate_skip=True):
@@ -69,6 +77,7 @@ class BaseTask:
         self._skip = False
         self._state = TaskState.Init
         self._celery_result = None
+        self._celery_ready_state = None
 
         self.workflow_name = None
         self.dag_name = None
@@ -149,6 +158,9 @@ class BaseTask:
     @property
     def celery_pending(self):
         """ Celery state: returns whether the task is queued. """
+        if self._celery_ready_state is not None:
+            return False
+
         if self.has_celery_result:
             return self.celery_result.state == "PENDING"
         else:
@@ -157,14 +169,23 @@ class BaseTask:
     @property
     def celery_completed(self):
         """ Celery state: returns whether the execution of the task has completed. """
+        if self._celery_ready_state is not None:
+            return True
+
         if self.has_celery_result:
-            return self.celery_result.ready()
+            if self.celery_result.ready():
+                self._remember_ready_state(self.celery_result.state)
+                return True
+            return False
         else:
             return False
 
     @property
     def celery_failed(self):
         """ Celery state: returns whether the execution of the task failed. """
+        if self._celery_ready_state is not None:
+            return self._celery_ready_state == states.FAILURE
+
         if self.has_celery_result:
             return self.celery_result.failed()
         else:
@@ -173,8 +194,13 @@ class BaseTask:
     @property
     def celery_state(self):
         """ Returns the current celery state of the task as a string. """
+        if self._celery_ready_state is not None:
+            return self._celery_ready_state
+
         if self.has_celery_result:
-            return self.celery_result.state
+            state = self.celery_result.state
+            self._remember_ready_state(state)
+            return state
         else:
             return "NOT_QUEUED"
 
@@ -199,6 +225,19 @@ class BaseTask:
             result (AsyncResult): The result of the celery queuing call.
         """
         self._celery_result = result
+        self._celery_ready_state = None
+
+    def _remember_ready_state(self, state):
+        """ Store the celery state of the task once it is final.
+
+        The state of a task that finished running never changes, thus it is answered
+        from memory afterwards, even after the result was removed from the backend.
+
+        Args:
+            state (str): The current celery state of the task.
+        """
+        if state in states.READY_STATES:
+            self._celery_ready_state = state
 
     def clear_celery_result(self):
         """ Removes the task's celery result from the result backend. """
@@ -282,17 +321,16 @@ class BaseTask:
         # handle the returned data (either implicitly or as an returned Action object) by
         # flattening all, possibly modified, input datasets in the MultiTask data down to
         # a single output dataset.
+        # The data is modified in place, as both the input data and the returned action
+        # are local to this task run.
         if result is None:
-            data.flatten(in_place=True)
-            data.add_task_history(self.name)
-            return Action(data)
-        else:
-            if not isinstance(result, Action):
-                raise TaskReturnActionInvalid()
+            result = Action(data)
+        elif not isinstance(result, Action):
+            raise TaskReturnActionInvalid()
 
-            result.data.flatten(in_place=True)
-            result.data.add_task_history(self.name)
-            return result
+        result.data.flatten(in_place=True)
+        result.data.add_task_history(self.name)
+        return result
 
     def run(self, data, store, signal, context, **kwargs):
         """ The main run method of a task.
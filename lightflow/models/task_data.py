@@ -25,6 +25,11 @@ class TaskData:
         """
         self._task_history.append(task_name)
 
+    def remove_duplicate_history(self):
+        """ Remove repeated task names from the history, keeping the first occurrence. """
+        if len(set(self._task_history)) != len(self._task_history):
+            self._task_history[:] = list(dict.fromkeys(self._task_history))
+
     @property
     def data(self):
         """ Return the data of this dataset. """
@@ -76,9 +81,11 @@ class TaskData:
 
         merge_data(dataset.data, self._data)
 
+        known_history = set(self._task_history)
         for h in dataset.task_history:
-            if h not in self._task_history:
+            if h not in known_history:
                 self._task_history.append(h)
+                known_history.add(h)
 
     def __deepcopy__(self, memo):
         """ Copy the object. """
@@ -129,6 +136,51 @@ class MultiTaskData:
         self._aliases = {} if aliases is None else {a: 0 for a in aliases}
         self._default_index = 0
 
+    @classmethod
+    def from_single(cls, task_name, dataset, *, alias=None):
+        """ Create a MultiTaskData object holding the dataset of a single task.
+
+        Args:
+            task_name (str): The name of the task from which the dataset was received.
+            dataset (TaskData): The dataset of the task.
+            alias (str): An optional alias that should be registered with the dataset.
+
+        Returns:
+            MultiTaskData: A new MultiTaskData object with the dataset as its default.
+        """
+        multi_data = cls.__new__(cls)
+        multi_data._datasets = [dataset]
+        multi_data._aliases = {task_name: 0}
+        if alias is not None:
+            multi_data._aliases[alias] = 0
+        multi_data._default_index = 0
+        return multi_data
+
+    @classmethod
+    def from_datasets(cls, task_names, datasets, aliases):
+        """ Create a MultiTaskData object holding the datasets of several tasks.
+
+        The three lists are parallel, the first dataset becomes the default dataset.
+
+        Args:
+            task_names (list): The names of the tasks from which the datasets were
+                               received.
+            datasets (list): The datasets of the tasks.
+            aliases (list): For each dataset an alias that should be registered with the
+                            dataset, or None.
+
+        Returns:
+            MultiTaskData: A new MultiTaskData object with all datasets.
+        """
+        multi_data = cls.__new__(cls)
+        multi_data._datasets = list(datasets)
+        multi_data._aliases = dict(zip(task_names, range(len(multi_data._datasets))))
+        for index, alias in enumerate(aliases):
+            if alias is not None:
+                multi_data._aliases[alias] = index
+        multi_data._default_index = 0
+        return multi_data
+
     @property
     def default_index(self):
         """ Return the index of the default dataset. """
@@ -143,18 +195,22 @@ class MultiTaskData:
         """
         return self.get_by_index(self._default_index)
 
-    def add_dataset(self, task_name, dataset=None, *, aliases=None):
+    def add_dataset(self, task_name, dataset=None, *, aliases=None, alias=None):
         """ Add a new dataset to the MultiTaskData.
 
         Args:
             task_name (str): The name of the task from which the dataset was received.
             dataset (TaskData): The dataset that should be added.
             aliases (list): A list of aliases that should be registered with the dataset.
+            alias (str): A single alias that should be registered with the dataset.
         """
         self._datasets.append(dataset if dataset is not None else TaskData())
         last_index = len(self._datasets) - 1
         self._aliases[task_name] = last_index
 
+        if alias is not None:
+            self._aliases[alias] = last_index
+
         if aliases is not None:
             for alias in aliases:
                 self._aliases[alias] = last_index
@@ -191,6 +247,11 @@ class MultiTaskData:
         Returns:
             MultiTaskData: If the in_place flag is set to False.
         """
+        # a single dataset is already flat, only duplicates in its history are removed
+        if in_place and len(self._datasets) == 1:
+            self._datasets[0].remove_duplicate_history()
+            return
+
         new_dataset = TaskData()
 
         for i, dataset in enumerate(self._datasets):
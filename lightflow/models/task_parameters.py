@@ -18,7 +18,6 @@ class TaskParameters(dict):
     def __init__(self, *args, **kwargs):
         """ Initialise the class by passing any arguments down to the dict base type. """
         super().__init__(*args, **kwargs)
-        self.update(*args, **kwargs)
 
     def __getattr__(self, key):
         """ Return the parameter value for a key using attribute-style dot notation.
@@ -29,9 +28,9 @@ class TaskParameters(dict):
         Returns:
             str: The parameter value stored under the specified key.
         """
-        if key in self:
+        try:
             return self[key]
-        else:
+        except KeyError:
             raise AttributeError()
 
     def __setattr__(self, key, value):
@@ -76,18 +75,12 @@ class TaskParameters(dict):
             TaskParameters: A new TaskParameters object with the callable parameters
                             replaced by their return value.
         """
-        exclude = [] if exclude is None else exclude
-
-        result = {}
-        for key, value in self.items():
-            if key in exclude:
-                continue
+        exclude = set() if exclude is None else set(exclude)
 
-            if value is not None and callable(value):
-                result[key] = value(data, data_store)
-            else:
-                result[key] = value
-        return TaskParameters(result)
+        return TaskParameters({
+            key: value(data, data_store) if callable(value) else value
+            for key, value in self.items() if key not in exclude
+        })
 
     def eval_single(self, key, data, data_store):
         """ Evaluate the value of a single parameter taking into account callables .
@@ -5,15 +5,25 @@ from .task_data import MultiTaskData
 
 class TaskSignal:
     """ Class to wrap the construction and sending of signals into easy to use methods."""
-    def __init__(self, client, dag_name):
+    def __init__(self, client, dag_name, *, stop_flag=None):
         """ Initialise the task signal convenience class.
 
         Args:
             client (Client): A reference to a signal client object.
             dag_name (str): The name of the dag the task belongs to.
+            stop_flag (StopFlag): An optional flag that is set by the workflow when the
+                                  dag of the task is stopped.
         """
         self._client = client
         self._dag_name = dag_name
+        self._stop_flag = stop_flag
+        self._stopped = False
+
+        # the payloads of the requests concerning the dag of the task are built once.
+        # The requests themselves are created for every call, as their unique id
+        # tags the response of the server.
+        self._stop_dag_payload = {'name': dag_name}
+        self._is_stopped_payload = {'dag_name': dag_name}
 
     def start_dag(self, dag, *, data=None):
         """ Schedule the execution of a dag by sending a signal to the workflow.
@@ -69,7 +79,7 @@ class TaskSignal:
         return self._client.send(
             Request(
                 action='stop_dag',
-                payload={'name': name if name is not None else self._dag_name}
+                payload={'name': name} if name is not None else self._stop_dag_payload
             )
         ).success
 
@@ -94,13 +104,18 @@ class TaskSignal:
         particularly important for long running tasks and tasks that employ an
         infinite loop, such as trigger tasks.
 
+        If a stop flag is available it is checked directly, instead of sending a
+        request to the workflow. A stop cannot be undone, so once the flag was found to
+        be set, it is not checked again.
+
         Returns:
             bool: True if the task should be stopped.
         """
+        if self._stop_flag is not None:
+            if not self._stopped:
+                self._stopped = self._stop_flag.is_set
+            return self._stopped
+
         resp = self._client.send(
-            Request(
-                action='is_dag_stopped',
-                payload={'dag_name': self._dag_name}
-            )
-        )
+            Request(action='is_dag_stopped', payload=self._is_stopped_payload))
         return resp.payload['is_stopped']
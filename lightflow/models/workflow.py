@@ -1,23 +1,83 @@
+import os
 import sys
 import copy
 import inspect
 import importlib
+import importlib.util
 from time import sleep
+from functools import lru_cache
 
 from .dag import Dag
 from .exceptions import (WorkflowImportError, WorkflowArgumentError,
                          RequestActionUnknown, RequestFailed, DagNameUnknown)
-from .signal import Response
+from .signal import Response, StopFlag, EventQueue
+from .dag_signal import stop_flag_key, task_events_key, DAG_STOP_EVENT
 from .parameters import Parameters
 from lightflow.logger import get_logger
 from lightflow.queue.app import create_app
+from lightflow.queue.results import fetch_ready_results
 from lightflow.queue.const import JobExecPath, DefaultJobQueueName
 
 MAX_SIGNAL_REQUESTS = 10
+MIN_POLLING_TIME = 0.01
+MAX_CACHED_WORKFLOW_MODULES = 128
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=MAX_CACHED_WORKFLOW_MODULES)
+def _get_workflow_code(loader, name, modified_time):
+    """ Return the compiled code of a workflow module.
+
+    The code is cached for each module loader and modification time of the module file,
+    such that loading an unchanged workflow again neither reads nor compiles the file.
+    Only the code is cached. It is executed again for every load, which gives each
+    workflow its own dag and parameter objects.
+
+    Args:
+        loader (Loader): The loader of the workflow module, used as part of the cache key.
+        name (str): The name of the workflow module.
+        modified_time (int): The modification time of the module file in nanoseconds,
+                             used as part of the cache key.
+
+    Returns:
+        code: The code object of the workflow module.
+    """
+    return loader.get_code(name)
+
+
+def _import_workflow_module(name):
+    """ Import a workflow module without keeping it in sys.modules.
+
+    Args:
+        name (str): The name of the workflow module.
+
+    Returns:
+        module: A freshly executed workflow module.
+
+    Raises:
+        ImportError: If the workflow module cannot be found or imported.
+    """
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError('Cannot find workflow {}'.format(name))
+
+    if spec.origin is None or not os.path.isfile(spec.origin) or \
+            not hasattr(spec.loader, 'get_code'):
+        workflow_module = importlib.import_module(name)
+        del sys.modules[name]
+        return workflow_module
+
+    code = _get_workflow_code(spec.loader, name, os.stat(spec.origin).st_mtime_ns)
+    workflow_module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = workflow_module
+    try:
+        exec(code, workflow_module.__dict__)
+    finally:
+        del sys.modules[name]
+    return workflow_module
+
+
 class Workflow:
     """ A workflow manages the execution and monitoring of dags.
 
@@ -49,6 +109,7 @@ class Workflow:
         self._provided_arguments = {}
 
         self._celery_app = None
+        self._signal_connection = None
 
         self._stop_workflow = False
         self._stop_dags = []
@@ -130,21 +191,25 @@ class Workflow:
         arguments = {} if arguments is None else arguments
 
         try:
-            workflow_module = importlib.import_module(name)
+            workflow_module = _import_workflow_module(name)
 
             dag_present = False
 
             # extract objects of specific types from the workflow module
-            for key, obj in workflow_module.__dict__.items():
+            for obj in workflow_module.__dict__.values():
+                # most module attributes are neither, so test both types with a
+                # single call
+                if not isinstance(obj, (Dag, Parameters)):
+                    continue
+
                 if isinstance(obj, Dag):
                     self._dags_blueprint[obj.name] = obj
                     dag_present = True
-                elif isinstance(obj, Parameters):
+                else:
                     self._parameters.extend(obj)
 
             self._name = name
             self._docstring = inspect.getdoc(workflow_module)
-            del sys.modules[name]
 
             if strict_dag and not dag_present:
                 raise WorkflowImportError(
@@ -180,21 +245,29 @@ class Workflow:
         """
         self._workflow_id = workflow_id
         self._celery_app = create_app(config)
+        self._signal_connection = signal_server.connection
 
-        # pre-fill the data store with supplied arguments
+        # pre-fill the data store with supplied arguments, writing them all at once
         args = self._parameters.consolidate(self._provided_arguments)
-        for key, value in args.items():
-            data_store.get(self._workflow_id).set(key, value)
+        store_doc = data_store.get(self._workflow_id)
+        with store_doc.batch():
+            for key, value in args.items():
+                store_doc.set(key, value)
 
         # start all dags with the autostart flag set to True
         for name, dag in self._dags_blueprint.items():
             if dag.autostart:
                 self._queue_dag(name)
 
-        # as long as there are dags in the list keep running
+        # as long as there are dags in the list keep running. The workflow does not
+        # sleep after an iteration that answered a request or saw a dag finish. While
+        # it is idle, the sleep time doubles up to the configured polling time.
+        polling_time = 0.0
         while self._dags_running:
-            if config.workflow_polling_time > 0.0:
-                sleep(config.workflow_polling_time)
+            if polling_time > 0.0:
+                sleep(polling_time)
+
+            progressed = False
 
             # handle new requests from dags, tasks and the library (e.g. cli, web)
             for i in range(MAX_SIGNAL_REQUESTS):
@@ -206,22 +279,40 @@ class Workflow:
                     response = self._handle_request(request)
                     if response is not None:
                         signal_server.send(response)
+                        progressed = True
                     else:
                         signal_server.restore(request)
                 except (RequestActionUnknown, RequestFailed):
                     signal_server.send(Response(success=False, uid=request.uid))
+                    progressed = True
 
-            # remove any dags and their result data that finished running
+            # remove any dags and their result data that finished running. The states of
+            # all running dags are fetched from the result backend with a single request.
+            ready_ids = fetch_ready_results(self._celery_app, self._dags_running.values())
             for name, dag in list(self._dags_running.items()):
+                if ready_ids is not None and dag.id not in ready_ids:
+                    continue
+
                 if dag.ready():
                     if self._celery_app.conf.result_expires == 0:
                         dag.forget()
                     del self._dags_running[name]
+                    progressed = True
                 elif dag.failed():
                     self._stop_workflow = True
 
-        # remove the signal entry
+            if progressed:
+                polling_time = 0.0
+            else:
+                polling_time = min(config.workflow_polling_time,
+                                   max(MIN_POLLING_TIME, 2 * polling_time))
+
+        # remove the signal entry, the stop flags of the dags and any stop events the
+        # dags did not consume anymore
         signal_server.clear()
+        for name in self._stop_dags:
+            self._stop_flag(name).clear()
+            self._task_events(name).clear()
 
         # delete all entries in the data_store under this workflow id, if requested
         if self._clear_data_store:
@@ -256,6 +347,43 @@ class Workflow:
 
         return new_dag.name
 
+    def _stop_dag(self, name):
+        """ Add a dag to the list of dags that should be stopped and set its stop flag.
+
+        A stop event is pushed onto the task event queue of the dag, which wakes up the
+        dag if it is waiting for its tasks to finish.
+
+        Args:
+            name (str): The name of the dag that should be stopped.
+        """
+        if name not in self._stop_dags:
+            self._stop_dags.append(name)
+            self._stop_flag(name).set()
+            self._task_events(name).push(DAG_STOP_EVENT)
+
+    def _stop_flag(self, name):
+        """ Return the flag that signals the tasks of a dag to stop.
+
+        Args:
+            name (str): The name of the dag.
+
+        Returns:
+            StopFlag: The stop flag of the dag.
+        """
+        return StopFlag(self._signal_connection, stop_flag_key(self._workflow_id, name))
+
+    def _task_events(self, name):
+        """ Return the queue of events the tasks of a dag push when they finish.
+
+        Args:
+            name (str): The name of the dag.
+
+        Returns:
+            EventQueue: The task event queue of the dag.
+        """
+        return EventQueue(self._signal_connection,
+                          task_events_key(self._workflow_id, name))
+
     def _handle_request(self, request):
         """ Handle an incoming request by forwarding it to the appropriate method.
 
@@ -326,8 +454,7 @@ class Workflow:
         """
         self._stop_workflow = True
         for name, dag in self._dags_running.items():
-            if name not in self._stop_dags:
-                self._stop_dags.append(name)
+            self._stop_dag(name)
         return Response(success=True, uid=request.uid)
 
     def _handle_join_dags(self, request):
@@ -350,8 +477,8 @@ class Workflow:
         if request.payload['names'] is None:
             send_response = len(self._dags_running) <= 1
         else:
-            send_response = all([name not in self._dags_running.keys()
-                                 for name in request.payload['names']])
+            send_response = all(name not in self._dags_running
+                                for name in request.payload['names'])
 
         if send_response:
             return Response(success=True, uid=request.uid)
@@ -375,9 +502,8 @@ class Workflow:
                           - success: True if the dag was added successfully to the list
                                      of dags that should be stopped.
         """
-        if (request.payload['name'] is not None) and \
-           (request.payload['name'] not in self._stop_dags):
-            self._stop_dags.append(request.payload['name'])
+        if request.payload['name'] is not None:
+            self._stop_dag(request.payload['name'])
         return Response(success=True, uid=request.uid)
 
     def _handle_is_dag_stopped(self, request):
@@ -1,19 +1,62 @@
+import os
 import logging.config
+from collections import OrderedDict
+from threading import Lock
 from kombu import Queue
 from celery import Celery
 from celery.result import AsyncResult
 from celery.signals import setup_logging, task_postrun
 from functools import partial
 
-from lightflow.queue.const import DefaultJobQueueName
+from lightflow.queue.const import DefaultJobQueueName, JobExecPath
 from lightflow.queue.pickle import patch_celery
 from lightflow.models.exceptions import ConfigOverwriteError
+from lightflow.models.signal import SignalConnection, EventQueue
+from lightflow.models.dag_signal import task_events_key
 
 
 LIGHTFLOW_INCLUDE = ['lightflow.queue.jobs', 'lightflow.models']
+MAX_CACHED_APPS = 16
+
+# the signal connections of this process, keyed by the process id and the settings
+_signal_connections = {}
+
+# the most recently used celery applications of this process, keyed by the process id
+# and the id of their configuration object
+_apps = OrderedDict()
+_apps_lock = Lock()
 
 
 def create_app(config):
+    """ Return a fully configured Celery application object.
+
+    The application is created once per configuration object and process and then
+    reused, such that the dags and workflows running on a worker share the connection
+    and producer pools of a single application instead of setting up new ones for
+    every run. This also keeps the signal handlers from being connected again and again.
+    Only the most recently used applications are kept, such that callers creating a new
+    configuration object for every call do not keep all of them alive.
+
+    Args:
+        config (Config): A reference to a lightflow configuration object.
+
+    Returns:
+        Celery: A fully configured Celery application object.
+    """
+    key = (os.getpid(), id(config))
+    with _apps_lock:
+        entry = _apps.get(key)
+        if entry is None or entry[0] is not config:
+            # the configuration is stored with the application, which keeps its id
+            # from being reused by another configuration object
+            entry = _apps[key] = (config, _create_app(config))
+            if len(_apps) > MAX_CACHED_APPS:
+                _apps.popitem(last=False)
+        _apps.move_to_end(key)
+    return entry[1]
+
+
+def _create_app(config):
     """ Create a fully configured Celery application object.
 
     Args:
@@ -26,6 +69,7 @@ def create_app(config):
     # configure the celery logging system with the lightflow settings
     setup_logging.connect(partial(_initialize_logging, config), weak=False)
     task_postrun.connect(partial(_cleanup_workflow, config), weak=False)
+    task_postrun.connect(_notify_dag, weak=False, dispatch_uid='lightflow_notify_dag')
 
     # patch Celery to use cloudpickle instead of pickle for serialisation
     patch_celery()
@@ -67,18 +111,57 @@ def _initialize_logging(config, **kwargs):
     logging.config.dictConfig(config.logging)
 
 
-def _cleanup_workflow(config, task_id, args, **kwargs):
+def _cleanup_workflow(config, task_id, task, **kwargs):
     """ Cleanup the results of a workflow when it finished.
 
     Connects to the postrun signal of Celery. If the signal was sent by a workflow,
-    remove the result from the result backend.
+    remove the result from the result backend. The workflow job is identified by the
+    name of the celery task, which avoids importing the workflow model for every job.
 
     Args:
         task_id (str): The id of the task.
-        args (tuple): The arguments the task was started with.
+        task (Task): The celery task that finished.
         **kwargs: Keyword arguments from the hook.
     """
-    from lightflow.models import Workflow
-    if isinstance(args[0], Workflow):
+    if task.name == JobExecPath.Workflow:
         if config.celery['result_expires'] == 0:
             AsyncResult(task_id).forget()
+
+
+def _notify_dag(task, args, **kwargs):
+    """ Notify the dag that one of its tasks finished running.
+
+    Connects to the postrun signal of Celery, which is sent after the result of the task
+    has been stored. If the signal was sent by a lightflow task, the name of the task is
+    pushed onto the event queue of its dag, which wakes up the dag immediately. The
+    signal settings are taken from the configuration of the worker that ran the task,
+    as the handler is connected only once per process.
+
+    Args:
+        task (Task): The celery task that finished.
+        args (tuple): The arguments the task was started with.
+        **kwargs: Keyword arguments from the hook.
+    """
+    if task.name == JobExecPath.Task:
+        dag_task, workflow_id = args[0], args[1]
+        config = task.app.user_options['config']
+        EventQueue(_get_signal_connection(config),
+                   task_events_key(workflow_id, dag_task.dag_name)).push(dag_task.name)
+
+
+def _get_signal_connection(config):
+    """ Return the signal connection of the current process.
+
+    Args:
+        config (Config): Reference to the configuration object from which the
+                         signal settings are retrieved.
+
+    Returns:
+        SignalConnection: A connected SignalConnection object.
+    """
+    key = (os.getpid(), tuple(sorted(config.signal.items())))
+    connection = _signal_connections.get(key)
+    if connection is None:
+        connection = _signal_connections.setdefault(
+            key, SignalConnection(**config.signal, auto_connect=True))
+    return connection
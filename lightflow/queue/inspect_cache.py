@@ -0,0 +1,89 @@
+import time
+from threading import Lock
+
+
+INSPECT_CACHE_TTL = 1.5
+
+_MISSING = object()
+
+
+class InspectCache:
+    """ Short-lived cache for the replies of celery inspect broadcasts.
+
+    Every inspect call (e.g. stats, active) broadcasts a request to all workers and waits
+    for their replies, which can take a second or more on larger clusters. The replies
+    are cached per broker, inspect method and destination for a short time, such that
+    helpers querying the same information in quick succession share a single broadcast.
+    Requests limited to a subset of workers are answered from a cached reply of all
+    workers if one is available.
+
+    Args:
+        ttl (float): The time in seconds a cached reply remains valid.
+    """
+    def __init__(self, ttl=INSPECT_CACHE_TTL):
+        self._ttl = ttl
+        self._lock = Lock()
+        self._entries = {}
+
+    def get(self, celery_app, method, *, destination=None):
+        """ Return the reply of an inspect method, broadcasting only on a cache miss.
+
+        Args:
+            celery_app: Reference to a celery application object.
+            method (str): The name of the inspect method, e.g. 'stats' or 'active'.
+            destination (list): Restrict the request to the workers in this list.
+
+        Returns:
+            dict: The replies keyed by the worker name or None if no worker replied.
+        """
+        broker = celery_app.conf.broker_url
+        destination = tuple(destination) if destination is not None else None
+
+        with self._lock:
+            now = time.monotonic()
+
+            reply = self._lookup((broker, method, None), now)
+            if reply is not _MISSING:
+                if destination is None or reply is None:
+                    return reply
+                reply = {name: reply[name] for name in destination if name in reply}
+                return reply if len(reply) > 0 else None
+
+            key = (broker, method, destination)
+            reply = self._lookup(key, now)
+            if reply is _MISSING:
+                inspect = celery_app.control.inspect(
+                    destination=list(destination) if destination is not None else None)
+                reply = getattr(inspect, method)()
+                self._entries[key] = (time.monotonic(), reply)
+
+            return reply
+
+    def clear(self):
+        """ Remove all cached replies. """
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key, now):
+        """ Return a cached reply if it is still valid.
+
+        Args:
+            key (tuple): The key of the cache entry.
+            now (float): The current monotonic time in seconds.
+
+        Returns:
+            The cached reply or _MISSING if no valid entry exists.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+
+        timestamp, reply = entry
+        if now - timestamp > self._ttl:
+            del self._entries[key]
+            return _MISSING
+
+        return reply
+
+
+inspect_cache = InspectCache()
@@ -1,17 +1,62 @@
+import os
 import celery
 from datetime import datetime
 from functools import partial
+from threading import Lock
+from celery.signals import worker_process_shutdown
 
 from lightflow.logger import get_logger
 from lightflow.models.task_signal import TaskSignal
 from lightflow.models.task_context import TaskContext
-from lightflow.models.dag_signal import DagSignal
+from lightflow.models.dag_signal import DagSignal, task_events_key, stop_flag_key
 from lightflow.models.datastore import DataStore, DataStoreDocumentSection
-from lightflow.models.signal import Server, Client, SignalConnection
+from lightflow.models.signal import (Server, Client, SignalConnection, EventQueue,
+                                     StopFlag)
 from .const import JobType, JobEventName
 
 logger = get_logger(__name__)
 
+# the data store connections of this worker process, keyed by the process id and the
+# data store settings
+_data_stores = {}
+_data_stores_lock = Lock()
+
+
+def _get_data_store(config):
+    """ Return the data store connection of the current worker process.
+
+    The connection is created on first use and then shared by all jobs that run in the
+    same process, which avoids connecting to MongoDB for every workflow, dag and task.
+    The process id is part of the key, such that forked processes never share a client.
+
+    Args:
+        config (Config): Reference to the configuration object from which the data
+                         store settings are retrieved.
+
+    Returns:
+        DataStore: A connected DataStore object.
+    """
+    key = (os.getpid(), tuple(sorted(config.data_store.items())))
+    with _data_stores_lock:
+        data_store = _data_stores.get(key)
+        if data_store is None:
+            data_store = DataStore(**config.data_store, auto_connect=True)
+            _data_stores[key] = data_store
+    return data_store
+
+
+@worker_process_shutdown.connect
+def _close_data_stores(**kwargs):
+    """ Close all data store connections when the worker process shuts down.
+
+    Args:
+        **kwargs: Keyword arguments from the hook.
+    """
+    with _data_stores_lock:
+        for data_store in _data_stores.values():
+            data_store.disconnect()
+        _data_stores.clear()
+
 
 @celery.task(bind=True)
 def execute_workflow(self, workflow, workflow_id=None):
@@ -29,8 +74,7 @@ def execute_workflow(self, workflow, workflow_id=None):
     start_time = datetime.utcnow()
 
     logger.info('Running workflow <{}>'.format(workflow.name))
-    data_store = DataStore(**self.app.user_options['config'].data_store,
-                           auto_connect=True)
+    data_store = _get_data_store(self.app.user_options['config'])
 
     # create a unique workflow id for this run
     if data_store.exists(workflow_id):
@@ -114,8 +158,7 @@ def execute_dag(self, dag, workflow_id, data=None):
     start_time = datetime.utcnow()
     logger.info('Running DAG <{}>'.format(dag.name))
 
-    store_doc = DataStore(**self.app.user_options['config'].data_store,
-                          auto_connect=True).get(workflow_id)
+    store_doc = _get_data_store(self.app.user_options['config']).get(workflow_id)
     store_loc = 'log.{}'.format(dag.name)
 
     # update data store with provenance information
@@ -138,9 +181,12 @@ def execute_dag(self, dag, workflow_id, data=None):
                             'workflow_id': workflow_id})
 
     # run the tasks in the DAG
-    signal = DagSignal(Client(SignalConnection(**self.app.user_options['config'].signal,
-                                               auto_connect=True),
-                              request_key=workflow_id), dag.name)
+    connection = SignalConnection(**self.app.user_options['config'].signal,
+                                  auto_connect=True)
+    signal = DagSignal(Client(connection, request_key=workflow_id), dag.name,
+                       task_events=EventQueue(connection,
+                                              task_events_key(workflow_id, dag.name)),
+                       stop_flag=StopFlag(connection, stop_flag_key(workflow_id, dag.name)))
     dag.run(config=self.app.user_options['config'],
             workflow_id=workflow_id,
             signal=signal,
@@ -182,8 +228,7 @@ def execute_task(self, task, workflow_id, data=None):
     """
     start_time = datetime.utcnow()
 
-    store_doc = DataStore(**self.app.user_options['config'].data_store,
-                          auto_connect=True).get(workflow_id)
+    store_doc = _get_data_store(self.app.user_options['config']).get(workflow_id)
     store_loc = 'log.{}.tasks.{}'.format(task.dag_name, task.name)
 
     def handle_callback(message, event_type, exc=None):
@@ -244,13 +289,15 @@ def execute_task(self, task, workflow_id, data=None):
     handle_callback('Start task <{}>'.format(task.name), JobEventName.Started)
 
     # run the task and capture the result
+    connection = SignalConnection(**self.app.user_options['config'].signal,
+                                  auto_connect=True)
     return task._run(
         data=data,
         store=store_doc,
-        signal=TaskSignal(Client(
-            SignalConnection(**self.app.user_options['config'].signal, auto_connect=True),
-            request_key=workflow_id),
-            task.dag_name),
+        signal=TaskSignal(Client(connection, request_key=workflow_id),
+                          task.dag_name,
+                          stop_flag=StopFlag(connection,
+                                             stop_flag_key(workflow_id, task.dag_name))),
         context=TaskContext(task.name, task.dag_name, task.workflow_name,
                             workflow_id, self.request.hostname),
         success_callback=partial(handle_callback,
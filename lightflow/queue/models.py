@@ -185,13 +185,15 @@ class JobStats:
         self.routing_key = routing_key
 
     @classmethod
-    def from_celery(cls, worker_name, job_dict, celery_app):
+    def from_celery(cls, worker_name, job_dict, celery_app, *, info=None):
         """ Create a JobStats object from the dictionary returned by celery.
 
         Args:
             worker_name (str): The name of the worker this jobs runs on.
             job_dict (dict): The dictionary as returned by celery.
             celery_app: Reference to a celery application object.
+            info (dict): The information the job stored in the result backend. If it
+                is None, the information is retrieved from the result backend.
 
         Returns:
             JobStats: A fully initialized JobStats object.
@@ -199,17 +201,18 @@ class JobStats:
         if not isinstance(job_dict, dict) or 'id' not in job_dict:
             raise JobStatInvalid('The job description is missing important fields.')
 
-        async_result = AsyncResult(id=job_dict['id'], app=celery_app)
-        a_info = async_result.info if isinstance(async_result.info, dict) else None
+        if info is None:
+            info = AsyncResult(id=job_dict['id'], app=celery_app).info
+        a_info = info if isinstance(info, dict) else {}
 
         return JobStats(
-            name=a_info.get('name', '') if a_info is not None else '',
+            name=a_info.get('name', ''),
             job_id=job_dict['id'],
-            job_type=a_info.get('type', '') if a_info is not None else '',
-            workflow_id=a_info.get('workflow_id', '') if a_info is not None else '',
-            queue=a_info.get('queue', '') if a_info is not None else '',
-            start_time=a_info.get('start_time', None) if a_info is not None else None,
-            arguments=a_info.get('arguments', {}) if a_info is not None else {},
+            job_type=a_info.get('type', ''),
+            workflow_id=a_info.get('workflow_id', ''),
+            queue=a_info.get('queue', ''),
+            start_time=a_info.get('start_time', None),
+            arguments=a_info.get('arguments', {}),
             acknowledged=job_dict['acknowledged'],
             func_name=job_dict['type'],
             hostname=job_dict['hostname'],
@@ -0,0 +1,148 @@
+from celery import states
+from celery.backends.base import KeyValueStoreBackend
+from celery.result import AsyncResult
+
+# the database result backend is only available if SQLAlchemy is installed
+try:
+    from celery.backends.database import DatabaseBackend, session_cleanup
+    from celery.backends.database.models import Task as DatabaseTask
+except ImportError:
+    DatabaseBackend = None
+
+
+def fetch_job_infos(celery_app, job_ids, *, executor=None):
+    """ Return the information the jobs stored about themselves in the result backend.
+
+    Key-value result backends, such as redis, return the information for all jobs with
+    a single request. For all other backends the information is looked up job by job,
+    optionally using the map function of an executor to run the lookups concurrently.
+
+    Args:
+        celery_app: Reference to a celery application object.
+        job_ids (list): The ids of the jobs.
+        executor (Executor): Optional executor used to run the lookups for backends
+            that do not support fetching multiple results at once.
+
+    Returns:
+        dict: The information of each job keyed by the job id. An empty dictionary is
+            returned for a job without information in the result backend.
+    """
+    job_ids = list(job_ids)
+    if len(job_ids) == 0:
+        return {}
+
+    metas = _fetch_metas(celery_app, job_ids)
+    if metas is not None:
+        infos = [meta['result'] if meta else None for meta in metas]
+        return {job_id: info if isinstance(info, dict) else {}
+                for job_id, info in zip(job_ids, infos)}
+
+    def fetch_info(job_id):
+        info = AsyncResult(id=job_id, app=celery_app).info
+        return info if isinstance(info, dict) else {}
+
+    map_func = executor.map if executor is not None else map
+    return dict(zip(job_ids, map_func(fetch_info, job_ids)))
+
+
+def fetch_ready_results(celery_app, async_results, *, executor=None):
+    """ Check which of the given results are ready using a single backend request.
+
+    The result objects of jobs that finished running store the fetched state and return
+    value, such that subsequent calls to ready(), failed(), state or result are answered
+    without querying the result backend again.
+
+    For synchronous backends that do not support fetching multiple results at once, the
+    results can be checked concurrently using the map function of an executor. The
+    results of asynchronous backends (e.g. rpc) are never checked concurrently, as their
+    result consumer is not thread-safe.
+
+    Args:
+        celery_app: Reference to a celery application object.
+        async_results (list): The AsyncResult objects that should be checked.
+        executor (Executor): Optional executor used to check the results for backends
+            that do not support fetching multiple results at once.
+
+    Returns:
+        set: The ids of the results that are ready or None if the result backend does
+            not support fetching multiple results at once and no executor was given.
+    """
+    async_results = list(async_results)
+    if len(async_results) == 0:
+        return set()
+
+    metas = _fetch_metas(celery_app, [result.id for result in async_results])
+    if metas is None:
+        if executor is None or getattr(celery_app.backend, 'is_async', True):
+            return None
+
+        ready = executor.map(lambda result: result.ready(), async_results)
+        return {result.id for result, is_ready in zip(async_results, ready) if is_ready}
+
+    ready_ids = set()
+    for result, meta in zip(async_results, metas):
+        if meta is not None and meta['status'] in states.READY_STATES:
+            result._maybe_set_cache(meta)
+            ready_ids.add(result.id)
+    return ready_ids
+
+
+def _fetch_metas(celery_app, job_ids):
+    """ Fetch the stored meta information of multiple jobs with a single request.
+
+    Args:
+        celery_app: Reference to a celery application object.
+        job_ids (list): The ids of the jobs.
+
+    The meta information is decoded in the same way as for a single result, e.g. the
+    result of a failed job is turned into its exception, such that it can be stored in
+    the cache of the job's AsyncResult object.
+
+    Returns:
+        list: The decoded meta dictionary of each job in the order of the job ids, or
+            None for a job that has nothing stored yet. If the result backend does not
+            support fetching multiple results at once, None is returned instead.
+    """
+    backend = celery_app.backend
+    if DatabaseBackend is not None and isinstance(backend, DatabaseBackend):
+        return _fetch_database_metas(backend, job_ids)
+
+    if not isinstance(backend, KeyValueStoreBackend):
+        return None
+
+    keys = [backend.get_key_for_task(job_id) for job_id in job_ids]
+    try:
+        values = backend.mget(keys)
+    except NotImplementedError:
+        return None
+
+    # some backends (e.g. memcached) return a mapping instead of a list
+    if hasattr(values, 'items'):
+        values = [values.get(key) for key in keys]
+
+    return [backend.meta_from_decoded(backend.decode(value)) if value else None
+            for value in values]
+
+
+def _fetch_database_metas(backend, job_ids):
+    """ Fetch the stored meta information of multiple jobs from the database backend.
+
+    All jobs are looked up with a single query in a single session. Outside of forked
+    worker processes, celery creates a new database connection for every session, so
+    querying the jobs one by one would open one connection per job.
+
+    Args:
+        backend (DatabaseBackend): Reference to the database result backend.
+        job_ids (list): The ids of the jobs.
+
+    Returns:
+        list: The meta dictionary of each job in the order of the job ids, or None for
+            a job that has nothing stored yet.
+    """
+    task_cls = getattr(backend, 'task_cls', DatabaseTask)
+    session = backend.ResultSession()
+    with session_cleanup(session):
+        rows = session.query(task_cls).filter(task_cls.task_id.in_(job_ids)).all()
+        metas = {row.task_id: backend.meta_from_decoded(row.to_dict()) for row in rows}
+
+    return [metas.get(job_id) for job_id in job_ids]
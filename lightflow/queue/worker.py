@@ -1,9 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from celery.result import AsyncResult
 from celery.bootsteps import StartStopStep
 
 from lightflow.models.signal import Client, Request, SignalConnection
 
 
+MAX_STOP_REQUEST_THREADS = 32
+
+
 class WorkerLifecycle(StartStopStep):
     """ Class that manages the lifecycle of a worker. """
 
@@ -11,7 +15,8 @@ class WorkerLifecycle(StartStopStep):
         """ This function is called when the worker received a request to terminate.
 
         Upon the termination of the worker, the workflows for all running jobs are
-        stopped gracefully.
+        stopped gracefully. The stop requests are sent in parallel, such that the time
+        to stop all workflows does not grow with the number of running workflows.
 
         Args:
             consumer (Consumer): Reference to the consumer object that handles messages
@@ -23,10 +28,18 @@ class WorkerLifecycle(StartStopStep):
 
             workflow_id = job.result['workflow_id']
             if workflow_id not in stopped_workflows:
-                client = Client(
-                    SignalConnection(**consumer.app.user_options['config'].signal,
-                                     auto_connect=True),
-                    request_key=workflow_id)
-                client.send(Request(action='stop_workflow'))
-
                 stopped_workflows.append(workflow_id)
+
+        if len(stopped_workflows) == 0:
+            return
+
+        connection = SignalConnection(**consumer.app.user_options['config'].signal,
+                                      auto_connect=True)
+
+        def send_stop_request(workflow_id):
+            client = Client(connection, request_key=workflow_id)
+            client.send(Request(action='stop_workflow'))
+
+        with ThreadPoolExecutor(max_workers=min(MAX_STOP_REQUEST_THREADS,
+                                                len(stopped_workflows))) as executor:
+            list(executor.map(send_stop_request, stopped_workflows))
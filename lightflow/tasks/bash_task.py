@@ -263,6 +263,9 @@ class BashTask(BaseTask):
         force_run (bool): Run the task even if it is flagged to be skipped.
         propagate_skip (bool): Propagate the skip flag to the next task.
     """
+    __slots__ = ('params', '_callback_process', '_callback_end', '_callback_stdout',
+                 '_callback_stderr')
+
     def __init__(self, name, command, cwd=None, env=None, user=None, group=None,
                  stdin=None, refresh_time=0.1, capture_stdout=False, capture_stderr=False,
                  callback_process=None, callback_end=None,
@@ -69,6 +69,8 @@ class PythonTask(BaseTask):
         force_run (bool): Run the task even if it is flagged to be skipped.
         propagate_skip (bool): Propagate the skip flag to the next task.
     """
+    __slots__ = ('_callback',)
+
     def __init__(self, name, callback=None, *, queue=DefaultJobQueueName.Task,
                  callback_init=None, callback_finally=None,
                  force_run=False, propagate_skip=True):
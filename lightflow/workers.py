@@ -4,6 +4,7 @@ from .models.datastore import DataStore
 
 from .queue.app import create_app
 from .queue.worker import WorkerLifecycle
+from .queue.inspect_cache import inspect_cache
 from .queue.models import WorkerStats, QueueStats
 
 
@@ -70,24 +71,24 @@ def list_workers(config, *, filter_by_queues=None):
         list: A list of WorkerStats objects.
     """
     celery_app = create_app(config)
-    worker_stats = celery_app.control.inspect().stats()
-    queue_stats = celery_app.control.inspect().active_queues()
+    worker_stats = inspect_cache.get(celery_app, 'stats')
+    queue_stats = inspect_cache.get(celery_app, 'active_queues')
 
     if worker_stats is None:
         return []
 
+    if queue_stats is None:
+        queue_stats = {}
+
+    if filter_by_queues is not None:
+        filter_by_queues = set(filter_by_queues)
+
     workers = []
     for name, w_stat in worker_stats.items():
-        queues = [QueueStats.from_celery(q_stat) for q_stat in queue_stats[name]]
-
-        add_worker = filter_by_queues is None
-        if not add_worker:
-            for queue in queues:
-                if queue.name in filter_by_queues:
-                    add_worker = True
-                    break
+        queues = [QueueStats.from_celery(q_stat) for q_stat in queue_stats.get(name, [])]
 
-        if add_worker:
+        if filter_by_queues is None or \
+                not filter_by_queues.isdisjoint(queue.name for queue in queues):
             workers.append(WorkerStats.from_celery(name, w_stat, queues))
 
     return workers
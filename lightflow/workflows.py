@@ -1,5 +1,6 @@
 import os
 import glob
+from concurrent.futures import ThreadPoolExecutor
 
 from .models import Workflow
 from .models.signal import Client, Request, SignalConnection
@@ -9,10 +10,27 @@ from .models.exceptions import (WorkflowImportError,
 
 from .queue.app import create_app
 from .queue.models import JobStats
+from .queue.results import fetch_job_infos
 from .queue.event import event_stream, create_event_model
+from .queue.inspect_cache import inspect_cache
 from .queue.const import JobExecPath, JobStatus, JobType, DefaultJobQueueName
 
 
+MAX_JOB_STATS_THREADS = 32
+MAX_STOP_REQUEST_THREADS = 32
+
+JOB_STATUS_INSPECT_METHOD = {
+    JobStatus.Active: 'active',
+    JobStatus.Registered: 'registered',
+    JobStatus.Reserved: 'reserved',
+    JobStatus.Scheduled: 'scheduled'
+}
+
+# the lookup of the job information in result backends that cannot return multiple
+# results at once is bound by the network latency, thus those lookups are run concurrently
+_job_stats_executor = ThreadPoolExecutor(max_workers=MAX_JOB_STATS_THREADS)
+
+
 def start_workflow(name, config, *, queue=DefaultJobQueueName.Workflow,
                    clear_data_store=True, store_args=None):
     """ Start a single workflow by sending it to the workflow queue.
@@ -65,24 +83,37 @@ def stop_workflow(config, *, names=None):
     """
     jobs = list_jobs(config, filter_by_type=JobType.Workflow)
 
+    # only workflows that are running on a worker are stopped, as nobody would answer
+    # a stop request for a workflow that is no longer running
     if names is not None:
-        filtered_jobs = []
-        for job in jobs:
-            if (job.id in names) or (job.name in names) or (job.workflow_id in names):
-                filtered_jobs.append(job)
+        names = set(names)
+        filtered_jobs = [job for job in jobs
+                         if not names.isdisjoint((job.id, job.name, job.workflow_id))]
     else:
         filtered_jobs = jobs
 
     success = []
     failed = []
-    for job in filtered_jobs:
-        client = Client(SignalConnection(**config.signal, auto_connect=True),
-                        request_key=job.workflow_id)
-
-        if client.send(Request(action='stop_workflow')).success:
-            success.append(job)
-        else:
-            failed.append(job)
+    if len(filtered_jobs) == 0:
+        return success, failed
+
+    # the redis client of the connection is thread-safe and shared by all requests.
+    # Each request needs its own Request object, as its uid is the key of the response
+    connection = SignalConnection(**config.signal, auto_connect=True)
+
+    def send_stop_request(job):
+        client = Client(connection, request_key=job.workflow_id)
+        return client.send(Request(action='stop_workflow')).success
+
+    # each request waits for the response of its workflow, thus they are sent in parallel
+    with ThreadPoolExecutor(max_workers=min(MAX_STOP_REQUEST_THREADS,
+                                            len(filtered_jobs))) as executor:
+        for job, stopped in zip(filtered_jobs,
+                                executor.map(send_stop_request, filtered_jobs)):
+            if stopped:
+                success.append(job)
+            else:
+                failed.append(job)
 
     return success, failed
 
@@ -139,37 +170,40 @@ def list_jobs(config, *, status=JobStatus.Active,
 
     # option to filter by the worker (improves performance)
     if filter_by_worker is not None:
-        inspect = celery_app.control.inspect(
-            destination=filter_by_worker if isinstance(filter_by_worker, list)
-            else [filter_by_worker])
+        destination = filter_by_worker if isinstance(filter_by_worker, list) \
+            else [filter_by_worker]
     else:
-        inspect = celery_app.control.inspect()
+        destination = None
 
     # get active, registered or reserved jobs
-    if status == JobStatus.Active:
-        job_map = inspect.active()
-    elif status == JobStatus.Registered:
-        job_map = inspect.registered()
-    elif status == JobStatus.Reserved:
-        job_map = inspect.reserved()
-    elif status == JobStatus.Scheduled:
-        job_map = inspect.scheduled()
+    if status in JOB_STATUS_INSPECT_METHOD:
+        job_map = inspect_cache.get(celery_app, JOB_STATUS_INSPECT_METHOD[status],
+                                    destination=destination)
     else:
         job_map = None
 
     if job_map is None:
         return []
 
+    # skip job descriptions that lack the job id
+    worker_jobs = [(worker_name, job)
+                   for worker_name, jobs in job_map.items() for job in jobs
+                   if isinstance(job, dict) and 'id' in job]
+
+    # fetch the information of all jobs from the result backend at once
+    job_infos = fetch_job_infos(celery_app, [job['id'] for _, job in worker_jobs],
+                                executor=_job_stats_executor)
+
     result = []
-    for worker_name, jobs in job_map.items():
-        for job in jobs:
-            try:
-                job_stats = JobStats.from_celery(worker_name, job, celery_app)
+    for worker_name, job in worker_jobs:
+        try:
+            job_stats = JobStats.from_celery(worker_name, job, celery_app,
+                                             info=job_infos[job['id']])
+        except JobStatInvalid:
+            continue
 
-                if (filter_by_type is None) or (job_stats.type == filter_by_type):
-                    result.append(job_stats)
-            except JobStatInvalid:
-                pass
+        if (filter_by_type is None) or (job_stats.type == filter_by_type):
+            result.append(job_stats)
 
     return result
 
@@ -0,0 +1,34 @@
+from unittest.mock import Mock, patch
+
+import pytest  # noqa
+
+from lightflow.queue.app import create_app, _notify_dag, MAX_CACHED_APPS
+from lightflow.queue.const import JobExecPath
+from lightflow.models.dag_signal import task_events_key
+
+
+def test_create_app_reuses_the_app_of_a_config():
+    config = Mock(celery={'result_expires': 0})
+    app = create_app(config)
+    assert create_app(config) is app
+    assert create_app(Mock(celery={'result_expires': 0})) is not app
+    assert app.conf.result_expires == 0
+
+
+def test_create_app_keeps_only_recent_apps():
+    configs = [Mock(celery={'result_expires': 0}) for _ in range(MAX_CACHED_APPS + 1)]
+    apps = [create_app(config) for config in configs]
+    assert create_app(configs[-1]) is apps[-1]
+    assert create_app(configs[0]) is not apps[0]
+
+
+@patch('lightflow.queue.app.EventQueue')
+@patch('lightflow.queue.app._get_signal_connection')
+def test_notify_dag_uses_the_config_of_the_worker(connection_mock, event_queue_mock):
+    config = Mock()
+    task = Mock(app=Mock(user_options={'config': config}))
+    task.name = JobExecPath.Task
+    _notify_dag(task=task, args=(Mock(dag_name='dag'), 'wf-id'))
+
+    connection_mock.assert_called_once_with(config)
+    assert event_queue_mock.call_args[0][1] == task_events_key('wf-id', 'dag')
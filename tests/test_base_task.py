@@ -1,3 +1,4 @@
+import pickle
 from unittest.mock import Mock, create_autospec, call
 
 import pytest  # noqa
@@ -187,3 +188,25 @@ def test_run_handles_action_response(data_mock, store_mock, signal_mock, context
 def test_run_handles_no_data(store_mock, signal_mock, context_mock):
     result = BaseTask('task-name')._run(None, store_mock, signal_mock, context_mock)
     assert result.data is not None
+
+
+def test_task_survives_pickling(task):
+    task.dag_name = 'dag-name'
+    task.state = TaskState.Completed
+    restored = pickle.loads(pickle.dumps(task))
+    assert restored.name == 'task-name'
+    assert restored.dag_name == 'dag-name'
+    assert restored.is_completed
+
+
+def test_base_task_remembers_final_celery_state(task):
+    celery_result = CeleryResultMock(state='SUCCESS', ready=True)
+    task.celery_result = celery_result
+    assert task.celery_completed is True
+
+    celery_result.state = 'PENDING'
+    celery_result._ready = False
+    assert task.celery_completed is True
+    assert task.celery_state == 'SUCCESS'
+    assert task.celery_pending is False
+    assert task.celery_failed is False
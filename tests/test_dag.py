@@ -0,0 +1,289 @@
+import pickle
+from copy import deepcopy
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest  # noqa
+
+from lightflow.models.dag import Dag, _TaskQueue
+from lightflow.models.task import BaseTask, TaskState
+from lightflow.models.action import Action
+from lightflow.models.exceptions import DirectedAcyclicGraphInvalid
+from lightflow.models.task_data import MultiTaskData, TaskData
+
+
+class FinishedResult:
+    """ A celery result that finished immediately with the given action. """
+    state = 'SUCCESS'
+
+    def __init__(self, task_id, action, events):
+        self.id = task_id
+        self._action = action
+        self._events = events
+
+    @property
+    def result(self):
+        self._events.append(('result', self.id))
+        return self._action
+
+    def ready(self):
+        return True
+
+    def failed(self):
+        return False
+
+    def forget(self):
+        self._events.append(('forget', self.id))
+
+
+@pytest.fixture
+def celery_app():
+    app = MagicMock()
+    app.conf.result_expires = 0
+    app.sent = []
+    app.events = []
+
+    def send_task(name, args, **kwargs):
+        task, workflow_id, data = args
+        app.sent.append((task.name, data))
+        app.events.append(('send', task.name))
+        limit = ['task-b'] if task.name == 'task-a' and app.limit else None
+        return FinishedResult(task.name, Action(
+            MultiTaskData(dataset=TaskData({'name': task.name})), limit=limit),
+            app.events)
+
+    app.send_task.side_effect = send_task
+    app.limit = False
+    yield app
+
+
+def run_dag(celery_app):
+    tasks = {name: BaseTask(name) for name in ('task-a', 'task-b', 'task-c', 'task-d')}
+    dag = Dag('dag', schema={tasks['task-a']: {tasks['task-b']: 'left',
+                                               tasks['task-c']: 'right'},
+                             tasks['task-b']: [tasks['task-d']],
+                             tasks['task-c']: [tasks['task-d']]})
+    signal = Mock(is_stopped=False)
+    with patch('lightflow.models.dag.create_app', return_value=celery_app):
+        dag.run(Mock(dag_polling_time=0.0), 'workflow-id', signal)
+    return tasks, signal
+
+
+def test_run_sends_tasks_in_dependency_order(celery_app):
+    tasks, signal = run_dag(celery_app)
+
+    names = [name for name, _ in celery_app.sent]
+    assert names[0] == 'task-a'
+    assert set(names[1:3]) == {'task-b', 'task-c'}
+    assert names[3] == 'task-d'
+
+    data = dict(celery_app.sent)
+    assert data['task-b']('left')['name'] == 'task-a'
+    assert data['task-c']('right')['name'] == 'task-a'
+    assert len(list(data['task-d'])) == 2
+    assert all(task.is_completed for task in tasks.values())
+    assert all(call[1]['producer'] is not None
+               for call in celery_app.send_task.call_args_list)
+    signal.clear_tasks.assert_called_once_with()
+
+
+def test_run_skips_tasks_excluded_by_limit(celery_app):
+    celery_app.limit = True
+    tasks, _ = run_dag(celery_app)
+
+    assert [name for name, _ in celery_app.sent] == ['task-a', 'task-b', 'task-d']
+    assert tasks['task-c'].is_skipped
+    assert len(list(dict(celery_app.sent)['task-d'])) == 1
+
+
+def test_run_reads_the_result_of_a_task_once(celery_app):
+    celery_app.limit = True
+    run_dag(celery_app)
+
+    assert celery_app.events.count(('result', 'task-a')) == 1
+
+
+def test_run_forgets_results_after_sending_the_next_tasks(celery_app):
+    run_dag(celery_app)
+
+    events = celery_app.events
+    assert events.index(('forget', 'task-a')) > events.index(('send', 'task-d'))
+    assert sorted(name for event, name in events if event == 'forget') == \
+        ['task-a', 'task-b', 'task-c', 'task-d']
+
+
+def test_run_does_not_validate_a_defined_schema_again(celery_app):
+    task = BaseTask('task-a')
+    dag = Dag('dag')
+    dag.define({task: None})
+    copied = deepcopy(dag)
+    with patch('lightflow.models.dag.create_app', return_value=celery_app), \
+            patch('lightflow.models.dag.nx.is_directed_acyclic_graph') as is_dag:
+        copied.run(Mock(dag_polling_time=0.0), 'workflow-id', Mock(is_stopped=False))
+    assert is_dag.called is False
+    assert [name for name, _ in celery_app.sent] == ['task-a']
+
+
+class PendingResult(FinishedResult):
+    """ A celery result that finishes once the test says so and counts its checks. """
+    def __init__(self, task_id, action, events):
+        super().__init__(task_id, action, events)
+        self.done = False
+        self.checks = 0
+
+    @property
+    def state(self):
+        return 'SUCCESS' if self.done else 'PENDING'
+
+    def ready(self):
+        self.checks += 1
+        return self.done
+
+
+def test_run_only_checks_the_tasks_that_reported_to_have_finished(celery_app):
+    results = {}
+
+    def send_task(name, args, **kwargs):
+        task = args[0]
+        results[task.name] = PendingResult(
+            task.name, Action(MultiTaskData(dataset=TaskData())), celery_app.events)
+        return results[task.name]
+
+    def wait_for_tasks(timeout):
+        if not results['task-a'].done:
+            results['task-a'].done = True
+            return ['task-a']
+        results['task-b'].done = True
+        return []
+
+    celery_app.send_task.side_effect = send_task
+    signal = Mock(is_stopped=False)
+    signal.wait_for_tasks.side_effect = wait_for_tasks
+    tasks = [BaseTask('task-a'), BaseTask('task-b')]
+    dag = Dag('dag', schema={task: None for task in tasks})
+    with patch('lightflow.models.dag.create_app', return_value=celery_app):
+        dag.run(Mock(dag_polling_time=0.0), 'workflow-id', signal)
+
+    assert all(task.is_completed for task in tasks)
+    # task-b is not checked in the pass that follows the notification about task-a,
+    # and task-a is removed in that pass without needing another one
+    assert results['task-a'].checks == 2
+    assert results['task-b'].checks == 3
+
+
+def test_run_sends_the_tasks_of_a_pass_with_one_producer(celery_app):
+    run_dag(celery_app)
+
+    # task-a, then task-b and task-c together, then task-d
+    assert celery_app.producer_or_acquire.call_count == 3
+
+
+def test_run_stops_a_task_only_once_when_its_predecessors_finish_apart(celery_app):
+    results = {}
+
+    def send_task(name, args, **kwargs):
+        task = args[0]
+        results[task.name] = PendingResult(
+            task.name, Action(MultiTaskData(dataset=TaskData())), celery_app.events)
+        results[task.name].done = task.name == 'task-a'
+        return results[task.name]
+
+    def wait_for_tasks(timeout):
+        # the dag is stopped first and task-b finishes after task-c was removed
+        if signal.is_stopped:
+            results['task-b'].done = True
+        signal.is_stopped = True
+        return []
+
+    celery_app.send_task.side_effect = send_task
+    signal = Mock(is_stopped=False)
+    signal.wait_for_tasks.side_effect = wait_for_tasks
+    tasks = {name: BaseTask(name) for name in ('task-a', 'task-b', 'task-c')}
+    dag = Dag('dag', schema={tasks['task-a']: [tasks['task-c']],
+                             tasks['task-b']: [tasks['task-c']]})
+    with patch('lightflow.models.dag.create_app', return_value=celery_app):
+        dag.run(Mock(dag_polling_time=0.0), 'workflow-id', signal)
+
+    assert tasks['task-a'].is_completed
+    assert tasks['task-b'].is_completed
+    assert tasks['task-c'].is_stopped
+    assert sorted(results) == ['task-a', 'task-b']
+
+
+def test_task_queue_matches_the_graph_of_the_schema():
+    a, b, c, d, e, f = (BaseTask(name) for name in
+                        ('task-a', 'task-b', 'task-c', 'task-d', 'task-e', 'task-f'))
+    schema = {a: {b: 'left', c: ''}, b: [d], c: d, d: (e,), e: {}, f: None}
+    graph = Dag.make_graph(schema)
+    task_queue = _TaskQueue(Dag._sanitize_schema(schema))
+
+    assert list(task_queue.predecessors) == list(graph)
+    for task in graph:
+        assert list(task_queue.predecessors[task]) == list(graph.predecessors(task))
+        assert list(task_queue.successors[task]) == list(graph.successors(task))
+        assert list(task_queue.input_slots[task]) == \
+            [(pre, slot) for pre, _, slot in graph.in_edges(task, data='slot')]
+
+
+def test_task_queue_removes_a_task_once_its_successors_finished():
+    a, b, c = (BaseTask(name) for name in ('task-a', 'task-b', 'task-c'))
+    task_queue = _TaskQueue(Dag._sanitize_schema({a: [b, c], b: None, c: None}))
+    task_queue.add_task(a)
+    task_queue.set_task_running(a)
+
+    assert task_queue.set_task_completed(a) == [b, c]
+    assert task_queue.remove_finished() == []
+    assert list(task_queue.running) == []
+
+    task_queue.set_task_finished(b, TaskState.Stopped)
+    assert task_queue.remove_finished() == [b]
+    task_queue.set_task_completed(c)
+    assert task_queue.remove_finished() == [c, a]
+    assert task_queue.tasks == {}
+
+
+def test_sanitize_schema_accepts_all_shapes_of_children():
+    schema = {'a': ['b', 'c'], 'b': ('d',), 'c': {'d': '', 'e': 'slot'}, 'd': 'e',
+              'e': [], 'f': {}, 'g': None}
+    assert Dag._sanitize_schema(schema) == {
+        'a': {'b': None, 'c': None},
+        'b': {'d': None},
+        'c': {'d': None, 'e': 'slot'},
+        'd': {'e': None},
+        'e': {None: None},
+        'f': {None: None},
+        'g': {None: None},
+    }
+
+
+def test_copied_dag_copies_the_shared_tasks_only_when_run(celery_app):
+    task = BaseTask('task-a')
+    dag = Dag('dag', schema={task: None})
+    copied = deepcopy(dag)
+    assert copied._schema is dag._schema
+    assert pickle.loads(pickle.dumps(copied))._is_shared is False
+
+    with patch('lightflow.models.dag.create_app', return_value=celery_app):
+        copied.run(Mock(dag_polling_time=0.0), 'workflow-id', Mock(is_stopped=False))
+    assert copied._schema is not dag._schema
+    assert list(copied._schema)[0].is_completed
+    assert task.is_completed is False
+
+
+def test_run_validates_a_schema_redefined_without_validation(celery_app):
+    a, b = BaseTask('task-a'), BaseTask('task-b')
+    dag = Dag('dag')
+    dag.define({a: [b]})
+    dag.define({a: [b], b: [a]}, validate=False)
+    with patch('lightflow.models.dag.create_app', return_value=celery_app), \
+            pytest.raises(DirectedAcyclicGraphInvalid):
+        dag.run(Mock(dag_polling_time=0.0), 'workflow-id', Mock(is_stopped=False))
+
+
+def test_run_sends_the_tasks_with_most_successors_first(celery_app):
+    tasks = {name: BaseTask(name) for name in ('task-a', 'task-b', 'task-c', 'task-d')}
+    dag = Dag('dag', schema={tasks['task-a']: None,
+                             tasks['task-b']: [tasks['task-c'], tasks['task-d']]})
+    with patch('lightflow.models.dag.create_app', return_value=celery_app):
+        dag.run(Mock(dag_polling_time=0.0), 'workflow-id', Mock(is_stopped=False))
+
+    assert [name for name, _ in celery_app.sent][:2] == ['task-b', 'task-a']
@@ -0,0 +1,120 @@
+from unittest.mock import Mock, patch
+
+import pytest  # noqa
+from pymongo.errors import ConnectionFailure
+
+from lightflow.config import Config
+from lightflow.models.exceptions import DataStoreNotConnected
+from lightflow.models.datastore import DataStore, DataStoreDocument
+
+WORKFLOW_ID = '5a0000000000000000000000'
+
+
+def test_document_get_fetches_only_the_requested_field():
+    collection = Mock()
+    collection.find_one.return_value = {'data': {'nested': {'key': 42}}}
+    doc = DataStoreDocument(collection, Mock(), WORKFLOW_ID)
+
+    assert doc.get('nested.key') == 42
+    assert collection.find_one.call_args[0][1] == {'data.nested.key': 1, '_id': 0}
+
+
+def test_document_get_returns_the_default_for_a_missing_document():
+    collection = Mock()
+    collection.find_one.return_value = None
+    doc = DataStoreDocument(collection, Mock(), WORKFLOW_ID)
+
+    assert doc.get('missing', default=1) == 1
+
+
+@patch('lightflow.models.datastore.MongoClient')
+def test_data_store_configures_the_connection_pool(client_mock):
+    config = Config()
+    config.load_from_dict({})
+    DataStore(**config.data_store, auto_connect=True, handle_reconnect=False)
+
+    kwargs = client_mock.call_args[1]
+    assert kwargs['maxPoolSize'] == 100
+    assert kwargs['minPoolSize'] == 1
+    assert kwargs['maxIdleTimeMS'] == 300000
+
+
+@patch('lightflow.models.datastore.MongoClient')
+def test_data_store_remembers_a_successful_connection_check(client_mock):
+    data_store = DataStore('localhost', 27017, 'lightflow', auto_connect=True,
+                           handle_reconnect=False)
+    assert data_store.is_connected
+    assert data_store.is_connected
+    client_mock.return_value.admin.command.assert_called_once_with('ping')
+
+    data_store.disconnect()
+    data_store.connect()
+    assert data_store.is_connected
+    assert client_mock.return_value.admin.command.call_count == 2
+
+
+def test_document_encodes_only_non_primitive_values_into_gridfs():
+    grid_fs = Mock()
+    grid_fs.put.return_value = 'gridfs-id'
+    doc = DataStoreDocument(Mock(), grid_fs, WORKFLOW_ID)
+
+    value = {'a': [1, 2.0, 'x', {'b': True}], 'c': {1, 2}}
+    assert doc._encode_value(value) == {'a': [1, 2.0, 'x', {'b': True}], 'c': 'gridfs-id'}
+    assert grid_fs.put.call_count == 1
+    assert grid_fs.put.call_args[0][0][:2] == b'\x80\x04'
+
+
+def test_document_batch_writes_all_changes_at_once():
+    collection = Mock()
+    collection.find_one.return_value = {'data': {}}
+    doc = DataStoreDocument(collection, Mock(), WORKFLOW_ID)
+
+    with doc.batch():
+        assert doc.set('a', 1)
+        assert doc.push('b', 2)
+        assert doc.extend('c', [3, 4])
+        assert collection.bulk_write.called is False
+
+    assert collection.update_one.called is False
+    updates = collection.bulk_write.call_args[0][0]
+    assert [list(update._doc) for update in updates] == [
+        ['$set', '$currentDate'], ['$push', '$currentDate'], ['$push', '$currentDate']
+    ]
+    assert collection.bulk_write.call_args[1] == {'ordered': True}
+
+    doc.set('a', 2)
+    assert collection.update_one.call_count == 1
+
+
+def test_encode_value_keeps_primitive_containers():
+    doc = DataStoreDocument(Mock(), Mock(), WORKFLOW_ID)
+    items = [1, 2.0, 'a', True]
+    mapping = {'a': 1, 'b': 'b'}
+    assert doc._encode_value(items) is items
+    assert doc._encode_value(mapping) is mapping
+
+
+def test_document_batch_discards_changes_on_error():
+    collection = Mock()
+    collection.find_one.return_value = {'data': {}}
+    doc = DataStoreDocument(collection, Mock(), WORKFLOW_ID)
+
+    with pytest.raises(ValueError):
+        with doc.batch():
+            doc.set('a', 1)
+            raise ValueError()
+
+    assert collection.bulk_write.called is False
+    doc.set('a', 2)
+    assert collection.update_one.call_count == 1
+
+
+def test_document_batch_raises_when_not_connected():
+    collection = Mock()
+    collection.find_one.return_value = {'data': {}}
+    collection.bulk_write.side_effect = ConnectionFailure()
+    doc = DataStoreDocument(collection, Mock(), WORKFLOW_ID)
+
+    with pytest.raises(DataStoreNotConnected):
+        with doc.batch():
+            doc.set('a', 1)
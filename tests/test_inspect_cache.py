@@ -0,0 +1,49 @@
+from unittest.mock import Mock
+
+import pytest  # noqa
+
+from lightflow.queue.inspect_cache import InspectCache
+
+
+@pytest.fixture
+def celery_app():
+    app = Mock()
+    app.conf.broker_url = 'redis://localhost:6379/0'
+    app.control.inspect.return_value.active.return_value = {
+        'worker-1': [{'id': 'job-1'}],
+        'worker-2': [{'id': 'job-2'}],
+    }
+    yield app
+
+
+def test_inspect_cache_broadcasts_once_within_ttl(celery_app):
+    cache = InspectCache(ttl=60)
+    first = cache.get(celery_app, 'active')
+    second = cache.get(celery_app, 'active')
+    assert first == second
+    assert celery_app.control.inspect.return_value.active.call_count == 1
+
+
+def test_inspect_cache_broadcasts_again_after_ttl(celery_app):
+    cache = InspectCache(ttl=0)
+    cache.get(celery_app, 'active')
+    cache.get(celery_app, 'active')
+    assert celery_app.control.inspect.return_value.active.call_count == 2
+
+
+def test_inspect_cache_answers_destination_from_full_reply(celery_app):
+    cache = InspectCache(ttl=60)
+    cache.get(celery_app, 'active')
+    assert cache.get(celery_app, 'active', destination=['worker-2']) == {
+        'worker-2': [{'id': 'job-2'}]
+    }
+    assert cache.get(celery_app, 'active', destination=['worker-3']) is None
+    assert celery_app.control.inspect.return_value.active.call_count == 1
+
+
+def test_inspect_cache_clear(celery_app):
+    cache = InspectCache(ttl=60)
+    cache.get(celery_app, 'active')
+    cache.clear()
+    cache.get(celery_app, 'active')
+    assert celery_app.control.inspect.return_value.active.call_count == 2
@@ -0,0 +1,35 @@
+import pytest  # noqa
+
+from lightflow.models.parameters import Parameters, Option
+from lightflow.models.exceptions import WorkflowArgumentError
+
+
+@pytest.fixture
+def parameters():
+    yield Parameters([
+        Option('required'),
+        Option('number', default='1', type=int),
+        Option('flag', default=False, type=bool),
+    ])
+
+
+def test_process_returns_missing_and_consolidated_arguments(parameters):
+    missing, args = parameters.process({'number': '5', 'extra': 'value'})
+    assert missing == ['required']
+    assert args == {'number': 5, 'flag': False, 'extra': 'value'}
+
+
+def test_check_missing_and_consolidate(parameters):
+    assert parameters.check_missing({'required': 'ok'}) == []
+    assert parameters.consolidate({'required': 'ok', 'flag': 'yes'}) == {
+        'required': 'ok', 'number': 1, 'flag': True
+    }
+
+
+def test_process_raises_on_invalid_value(parameters):
+    with pytest.raises(WorkflowArgumentError):
+        parameters.process({'number': 'five'})
+
+
+def test_check_missing_does_not_convert_values(parameters):
+    assert parameters.check_missing({'number': 'five'}) == ['required']
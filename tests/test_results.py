@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from celery import Celery
+from celery.result import AsyncResult
+
+import pytest  # noqa
+
+from lightflow.queue.results import fetch_job_infos, fetch_ready_results
+
+
+@pytest.fixture
+def celery_app():
+    app = Celery('test', backend='cache+memory://')
+    app.conf.result_serializer = 'pickle'
+    app.conf.accept_content = ['pickle']
+    yield app
+
+
+def test_fetch_job_infos_from_key_value_backend(celery_app):
+    celery_app.backend.store_result('job-1', {'name': 'wf'}, 'PROGRESS')
+    celery_app.backend.store_result('job-2', 'not a dict', 'SUCCESS')
+
+    assert fetch_job_infos(celery_app, ['job-1', 'job-2', 'job-3']) == {
+        'job-1': {'name': 'wf'},
+        'job-2': {},
+        'job-3': {}
+    }
+
+
+def test_fetch_job_infos_without_jobs(celery_app):
+    assert fetch_job_infos(celery_app, []) == {}
+
+
+def test_fetch_ready_results_caches_finished_results(celery_app):
+    celery_app.backend.store_result('result-1', 'done', 'SUCCESS')
+    celery_app.backend.store_result('result-2', {'name': 'task'}, 'PROGRESS')
+    results = [AsyncResult(job_id, app=celery_app) for job_id in ('result-1', 'result-2', 'result-3')]
+
+    assert fetch_ready_results(celery_app, results) == {'result-1'}
+
+    celery_app.backend.delete(celery_app.backend.get_key_for_task('result-1'))
+    assert results[0].ready()
+    assert results[0].result == 'done'
+
+
+def test_fetch_ready_results_checks_results_concurrently_without_bulk_fetch():
+    celery_app = Mock()
+    celery_app.backend.is_async = False
+    results = [Mock(id='a', **{'ready.return_value': True}),
+               Mock(id='b', **{'ready.return_value': False})]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert fetch_ready_results(celery_app, results, executor=executor) == {'a'}
+
+    celery_app.backend.is_async = True
+    assert fetch_ready_results(celery_app, results, executor=executor) is None
+
+
+def test_fetch_ready_results_decodes_failures(celery_app):
+    celery_app.backend.mark_as_failure('result-failed', ValueError('broken'))
+    result = AsyncResult('result-failed', app=celery_app)
+
+    assert fetch_ready_results(celery_app, [result]) == {'result-failed'}
+    assert result.failed()
+    assert isinstance(result.result, ValueError)
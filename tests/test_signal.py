@@ -0,0 +1,109 @@
+from unittest.mock import Mock, patch
+
+import pytest  # noqa
+
+from lightflow.models.signal import EventQueue, StopFlag
+from lightflow.models.dag_signal import DagSignal
+from lightflow.models.task_signal import TaskSignal
+
+
+@pytest.fixture
+def connection():
+    conn = Mock()
+    conn.connection.pipeline.return_value.execute.return_value = [[b'task-2'], 1]
+    yield conn
+
+
+def test_event_queue_returns_all_available_events(connection):
+    connection.connection.blpop.return_value = (b'lightflow:key', b'task-1')
+    assert EventQueue(connection, 'key').wait(0.5) == ['task-1', 'task-2']
+    connection.connection.blpop.assert_called_once_with('lightflow:key', timeout=1)
+
+
+def test_event_queue_rounds_the_timeout_up_to_full_seconds(connection):
+    connection.connection.blpop.return_value = None
+    EventQueue(connection, 'key').wait(1.2)
+    connection.connection.blpop.assert_called_once_with('lightflow:key', timeout=2)
+    assert isinstance(connection.connection.blpop.call_args[1]['timeout'], int)
+
+
+def test_event_queue_returns_nothing_on_timeout(connection):
+    connection.connection.blpop.return_value = None
+    assert EventQueue(connection, 'key').wait(1.0) == []
+    assert connection.connection.pipeline.called is False
+
+
+def test_event_queue_does_not_block_without_timeout(connection):
+    assert EventQueue(connection, 'key').wait(0.0) == ['task-2']
+    assert connection.connection.blpop.called is False
+
+
+@patch('lightflow.models.dag_signal.sleep')
+def test_dag_signal_sleeps_without_event_queue(sleep_mock):
+    assert DagSignal(Mock(), 'dag').wait_for_tasks(0.5) == []
+    sleep_mock.assert_called_once_with(0.5)
+
+
+def test_dag_signal_does_not_report_the_stop_event_as_a_task():
+    task_events = Mock()
+    task_events.wait.return_value = ['task-a', 'lightflow:stop']
+    assert DagSignal(Mock(), 'dag', task_events=task_events).wait_for_tasks(0.5) == \
+        ['task-a']
+
+
+def test_task_signal_sends_a_new_request_for_every_stop_check():
+    client = Mock()
+    client.send.return_value.payload = {'is_stopped': False}
+    signal = TaskSignal(client, 'dag-name')
+    assert signal.is_stopped is False
+    assert signal.is_stopped is False
+    first, second = [c[0][0] for c in client.send.call_args_list]
+    assert first.action == 'is_dag_stopped'
+    assert first.payload == {'dag_name': 'dag-name'}
+    assert first.uid != second.uid
+
+
+def test_dag_signal_sends_a_new_request_for_every_stop_check():
+    client = Mock()
+    client.send.return_value.payload = {'is_stopped': False}
+    signal = DagSignal(client, 'dag-name')
+    assert signal.is_stopped is False
+    assert signal.is_stopped is False
+    first, second = [c[0][0] for c in client.send.call_args_list]
+    assert first.payload == {'dag_name': 'dag-name'}
+    assert first.uid != second.uid
+
+
+def test_task_signal_checks_the_stop_flag_until_it_is_set():
+    client = Mock()
+    stop_flag = Mock(is_set=False)
+    signal = TaskSignal(client, 'dag-name', stop_flag=stop_flag)
+    assert signal.is_stopped is False
+
+    stop_flag.is_set = True
+    assert signal.is_stopped is True
+
+    stop_flag.is_set = False
+    assert signal.is_stopped is True
+    assert client.send.called is False
+
+
+def test_dag_signal_checks_the_stop_flag_instead_of_the_workflow():
+    client = Mock()
+    stop_flag = Mock(is_set=False)
+    signal = DagSignal(client, 'dag-name', stop_flag=stop_flag)
+    assert signal.is_stopped is False
+
+    stop_flag.is_set = True
+    assert signal.is_stopped is True
+    assert client.send.called is False
+
+
+def test_stop_flag(connection):
+    flag = StopFlag(connection, 'key')
+    connection.connection.exists.return_value = 0
+    assert flag.is_set is False
+    flag.set()
+    connection.connection.set.assert_called_once_with('lightflow:key', 1, ex=86400)
+    connection.connection.exists.return_value = 1
+    assert flag.is_set is True
@@ -0,0 +1,45 @@
+import pytest  # noqa
+
+from lightflow.models.task_data import TaskData, MultiTaskData
+
+
+def test_flatten_single_dataset_keeps_dataset():
+    dataset = TaskData({'a': {'b': 1}}, task_history=['t1', 't2', 't1'])
+    data = MultiTaskData(dataset=dataset, aliases=['slot'])
+    data.flatten(in_place=True)
+
+    assert data.default_dataset is dataset
+    assert data('slot')['a'] == {'b': 1}
+    assert dataset.task_history == ['t1', 't2']
+
+
+def test_flatten_merges_datasets_onto_default():
+    data = MultiTaskData()
+    data.add_dataset('t1', TaskData({'a': 1, 'b': {'c': 1}}, task_history=['t1']))
+    data.add_dataset('t2', TaskData({'a': 2, 'b': {'d': 2}}, task_history=['t2']))
+    data.flatten(in_place=True)
+
+    assert data.default_dataset.data == {'a': 1, 'b': {'c': 1, 'd': 2}}
+    assert data('t2').task_history == ['t2', 't1']
+
+
+def test_from_single_matches_add_dataset():
+    dataset = TaskData()
+    expected = MultiTaskData()
+    expected.add_dataset('task-name', dataset, aliases=['slot'])
+    data = MultiTaskData.from_single('task-name', dataset, alias='slot')
+    assert data._aliases == expected._aliases
+    assert data.default_dataset is dataset
+    assert data.get_by_alias('slot') is dataset
+
+
+def test_from_datasets_matches_add_dataset():
+    datasets = [TaskData(), TaskData(), TaskData()]
+    aliases = ['left', None, 'right']
+    expected = MultiTaskData()
+    for name, dataset, alias in zip(['t1', 't2', 't3'], datasets, aliases):
+        expected.add_dataset(name, dataset, alias=alias)
+    data = MultiTaskData.from_datasets(['t1', 't2', 't3'], datasets, aliases)
+    assert data._aliases == expected._aliases
+    assert data.default_dataset is datasets[0]
+    assert data.get_by_alias('right') is datasets[2]
@@ -0,0 +1,21 @@
+import pickle
+
+import pytest  # noqa
+
+from lightflow.models.task_parameters import TaskParameters
+
+
+def test_eval_calls_callables_and_skips_excluded_keys():
+    params = TaskParameters(native=1, dynamic=lambda data, store: data + store,
+                            excluded=2, empty=None)
+    result = params.eval(1, 2, exclude=['excluded'])
+    assert result == {'native': 1, 'dynamic': 3, 'empty': None}
+    assert isinstance(result, TaskParameters)
+
+
+def test_attribute_access():
+    params = TaskParameters(command='ls')
+    assert params.command == 'ls'
+    with pytest.raises(AttributeError):
+        params.missing
+    assert pickle.loads(pickle.dumps(params)) == {'command': 'ls'}
@@ -0,0 +1,29 @@
+from unittest.mock import Mock, patch
+
+from lightflow.workers import list_workers
+
+
+def _stats(pid):
+    return {'broker': {'hostname': 'localhost', 'port': 6379, 'transport': 'redis',
+                       'virtual_host': '0'},
+            'pid': pid, 'pool': {'processes': [], 'max-concurrency': 1,
+                                 'writes': {'total': 0}}}
+
+
+@patch('lightflow.workers.inspect_cache')
+@patch('lightflow.workers.create_app')
+def test_list_workers_filters_by_queues(create_app_mock, cache_mock):
+    replies = {
+        'stats': {'worker-1': _stats(1), 'worker-2': _stats(2), 'worker-3': _stats(3)},
+        'active_queues': {
+            'worker-1': [{'name': 'dag', 'routing_key': 'dag'}],
+            'worker-2': [{'name': 'task', 'routing_key': 'task'},
+                         {'name': 'workflow', 'routing_key': 'workflow'}]
+        }
+    }
+    cache_mock.get.side_effect = lambda app, method: replies[method]
+
+    assert [w.name for w in list_workers(Mock())] == ['worker-1', 'worker-2', 'worker-3']
+    assert [w.name for w in list_workers(Mock(), filter_by_queues=['workflow'])] == [
+        'worker-2'
+    ]
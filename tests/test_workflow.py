@@ -1,8 +1,12 @@
 import sys
 from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest  # noqa
 
+from lightflow.models.dag import Dag
+from lightflow.models.task import BaseTask
+from lightflow.models.signal import Request
 from lightflow.models.workflow import Workflow
 from lightflow.models.exceptions import WorkflowImportError, WorkflowArgumentError
 
@@ -57,3 +61,43 @@ def test_load_workflow_when_validate_arguments_is_false():
 def test_workflow_from_name_constructor():
     wf = Workflow.from_name('parameters_workflow', arguments={'required_arg': 'ok'})
     assert wf.parameters[0].name == 'required_arg'
+
+
+def test_load_workflow_reuses_unchanged_module():
+    first = Workflow()
+    first.load('dag_present_workflow')
+    second = Workflow()
+    second.load('dag_present_workflow')
+    assert first._dags_blueprint.keys() == second._dags_blueprint.keys()
+    assert all(first._dags_blueprint[name] is not second._dags_blueprint[name]
+               for name in first._dags_blueprint)
+
+
+def test_stop_dag_request_sets_the_stop_flag_once():
+    wf = Workflow()
+    wf._workflow_id = 'workflow-id'
+    wf._signal_connection = Mock()
+    for _ in range(2):
+        wf._handle_request(Request('stop_dag', payload={'name': 'dag-name'}))
+    assert wf._stop_dags == ['dag-name']
+    wf._signal_connection.connection.set.assert_called_once_with(
+        'lightflow:workflow-id:dag-name:stopped', 1, ex=86400)
+    wf._signal_connection.connection.pipeline.return_value.rpush.assert_called_once_with(
+        'lightflow:workflow-id:dag-name:task_events', 'lightflow:stop')
+
+
+def test_run_backs_off_while_idle():
+    dag_result = Mock()
+    dag_result.ready.side_effect = [False, False, False, True]
+    celery_app = Mock()
+    celery_app.send_task.return_value = dag_result
+    signal_server = Mock()
+    signal_server.receive.return_value = None
+
+    wf = Workflow(clear_data_store=False)
+    wf._dags_blueprint = {'dag': Dag('dag', schema={BaseTask('task'): None})}
+    with patch('lightflow.models.workflow.create_app', return_value=celery_app), \
+            patch('lightflow.models.workflow.sleep') as sleep:
+        wf.run(Mock(workflow_polling_time=0.03), MagicMock(), signal_server, 'workflow-id')
+
+    assert [c[0][0] for c in sleep.call_args_list] == [0.01, 0.02, 0.03]
@@ -1,7 +1,9 @@
 from pathlib import Path
+from unittest.mock import Mock, patch
 
-from lightflow.workflows import list_workflows
+from lightflow.workflows import list_workflows, list_jobs, stop_workflow
 from lightflow.config import Config
+from lightflow.queue.const import JobType
 
 
 def test_list_workflows_when_no_workflow_dirs_in_config():
@@ -15,3 +17,62 @@ def test_list_workflows_handles_missing_parameters():
     workflows_path = str(Path(__file__).parent / 'fixtures/workflows')
     config.load_from_dict({'workflows': [workflows_path]})
     assert 'parameters_workflow' in {wf.name for wf in list_workflows(config)}
+
+
+def _job(job_id):
+    return {'id': job_id, 'acknowledged': True, 'type': 'execute', 'hostname': 'host',
+            'worker_pid': 1, 'delivery_info': {'routing_key': 'workflow'}}
+
+
+@patch('lightflow.queue.results.AsyncResult')
+@patch('lightflow.workflows.inspect_cache')
+@patch('lightflow.workflows.create_app')
+def test_list_jobs_filters_by_type_and_skips_invalid_jobs(create_app_mock, cache_mock,
+                                                          async_result_mock):
+    cache_mock.get.return_value = {
+        'worker-1': [_job('job-1'), {'no-id': True}],
+        'worker-2': [_job('job-2')],
+    }
+    infos = {'job-1': {'type': JobType.Workflow, 'name': 'wf'},
+             'job-2': {'type': JobType.Task, 'name': 'task'}}
+    async_result_mock.side_effect = lambda id, app: Mock(info=infos[id])
+
+    jobs = list_jobs(Mock(), filter_by_type=JobType.Workflow)
+    assert [(job.id, job.name, job.worker_name) for job in jobs] == [
+        ('job-1', 'wf', 'worker-1')
+    ]
+
+
+@patch('lightflow.workflows.Client')
+@patch('lightflow.workflows.SignalConnection')
+@patch('lightflow.workflows.list_jobs')
+def test_stop_workflow_matches_names_against_running_jobs(list_jobs_mock,
+                                                          connection_mock,
+                                                          client_mock):
+    list_jobs_mock.return_value = [Mock(id='job-1', workflow_id='wf-1'),
+                                   Mock(id='job-2', workflow_id='wf-2'),
+                                   Mock(id='job-3', workflow_id='wf-3')]
+    for job, name in zip(list_jobs_mock.return_value, ['a', 'b', 'c']):
+        job.name = name
+
+    success, failed = stop_workflow(Mock(signal={}),
+                                    names=['job-1', 'c', 'wf-1', 'job-crashed'])
+    assert [job.id for job in success] == ['job-1', 'job-3']
+    assert list_jobs_mock.call_count == 1
+    assert client_mock.call_count == 2
+
+
+@patch('lightflow.workflows.Client')
+@patch('lightflow.workflows.SignalConnection')
+@patch('lightflow.workflows.list_jobs')
+def test_stop_workflow_keeps_job_order_of_parallel_requests(list_jobs_mock,
+                                                            connection_mock,
+                                                            client_mock):
+    list_jobs_mock.return_value = [Mock(workflow_id='wf-{}'.format(i)) for i in range(5)]
+    client_mock.side_effect = lambda connection, request_key: Mock(**{
+        'send.return_value.success': request_key != 'wf-2'})
+
+    success, failed = stop_workflow(Mock(signal={}))
+    assert [job.workflow_id for job in success] == ['wf-0', 'wf-1', 'wf-3', 'wf-4']
+    assert [job.workflow_id for job in failed] == ['wf-2']
+    assert connection_mock.call_count == 1